@@ -6,11 +6,13 @@ High-performance API with sub-100ms response times.
 
 from fastapi import FastAPI, HTTPException, Query, BackgroundTasks, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel, field_validator
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
+import asyncio
+import functools
 import json
 import os
 import re
@@ -19,8 +21,11 @@ from pathlib import Path
 import uvicorn
 import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
-from workflow_db import WorkflowDatabase
+from workflow_db import WorkflowDatabase, encode_cursor, extract_connection_edges
+from workflow_diagram import DIAGRAM_VERSION, generate_mermaid_diagram
+from workflow_suggest import MAX_SUGGESTIONS, SuggestionIndex
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -58,6 +63,38 @@ app.add_middleware(
 # Initialize database
 db = WorkflowDatabase()
 
+# Blocking database queries and file reads run here instead of on the event
+# loop; sized to the reader pool so no worker waits for a connection
+db_executor = ThreadPoolExecutor(
+    max_workers=db.connections.max_readers, thread_name_prefix="workflow-db"
+)
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Await ``func(*args, **kwargs)`` on the database executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        db_executor, functools.partial(func, *args, **kwargs)
+    )
+
+
+def read_json_file(path: Path) -> Any:
+    """Parse a JSON file; call through run_blocking from async routes."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# Typeahead index, built at startup and replaced whenever the index changes
+suggestion_index: Optional[SuggestionIndex] = None
+
+
+def refresh_suggestion_index() -> SuggestionIndex:
+    """Rebuild the typeahead index from the current database contents."""
+    global suggestion_index
+    generation = db.get_generation()
+    suggestion_index = SuggestionIndex(db.get_suggestion_terms(), generation)
+    return suggestion_index
+
 
 # Security: Helper function for rate limiting
 def check_rate_limit(client_ip: str) -> bool:
@@ -141,16 +178,26 @@ def validate_filename(filename: str) -> bool:
 async def startup_event():
     """Verify database connectivity on startup."""
     try:
-        stats = db.get_stats()
+        stats = await run_blocking(db.get_stats)
         if stats["total"] == 0:
             print("⚠️  Warning: No workflows found in database. Run indexing first.")
+        elif db.read_only:
+            print(f"✅ Prebuilt snapshot loaded: {stats['total']} workflows indexed")
         else:
             print(f"✅ Database connected: {stats['total']} workflows indexed")
+        await run_blocking(refresh_suggestion_index)
     except Exception as e:
         print(f"❌ Database connection failed: {e}")
         raise
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the database executor and close pooled connections."""
+    db_executor.shutdown(wait=True)
+    db.close()
+
+
 # Response models
 class WorkflowSummary(BaseModel):
     id: Optional[int] = None
@@ -165,6 +212,7 @@ class WorkflowSummary(BaseModel):
     tags: List[str] = []
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
+    category: Optional[str] = None
 
     class Config:
         # Allow conversion of int to bool for active field
@@ -180,12 +228,17 @@ class WorkflowSummary(BaseModel):
 
 class SearchResponse(BaseModel):
     workflows: List[WorkflowSummary]
-    total: int
+    # None when the client asked for total=none
+    total: Optional[int]
     page: int
     per_page: int
-    pages: int
+    pages: Optional[int]
     query: str
     filters: Dict[str, Any]
+    # Pass back as `cursor` to fetch the following page; None after the last
+    next_cursor: Optional[str] = None
+    # Requested facet -> {value: result count}
+    facets: Optional[Dict[str, Dict[str, int]]] = None
 
 
 class StatsResponse(BaseModel):
@@ -229,34 +282,75 @@ async def health_check():
 async def get_stats():
     """Get workflow database statistics."""
     try:
-        stats = db.get_stats()
+        stats = await run_blocking(db.get_stats)
         return StatsResponse(**stats)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching stats: {str(e)}")
 
 
+@app.get("/api/stats/cache")
+async def get_cache_stats():
+    """Hit/miss counters of the in-process search result cache."""
+    return db.result_cache.stats()
+
+
 @app.get("/api/workflows", response_model=SearchResponse)
 async def search_workflows(
     q: str = Query("", description="Search query"),
     trigger: str = Query("all", description="Filter by trigger type"),
     complexity: str = Query("all", description="Filter by complexity"),
+    category: str = Query("all", description="Filter by browse category"),
     active_only: bool = Query(False, description="Show only active workflows"),
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
+    total: Literal["exact", "estimate", "none"] = Query(
+        "exact",
+        description="exact counts all matches, estimate only reports whether "
+        "another page exists, none skips counting",
+    ),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor from the previous page; replaces page offsets"
+    ),
+    facets: Optional[str] = Query(
+        None,
+        description="Comma-separated fields to count results by: "
+        "trigger_type, complexity, category, integration",
+    ),
 ):
     """Search and filter workflows with pagination."""
     try:
         offset = (page - 1) * per_page
 
-        workflows, total = db.search_workflows(
+        workflows, total_count = await run_blocking(
+            db.search_workflows,
             query=q,
             trigger_filter=trigger,
             complexity_filter=complexity,
             active_only=active_only,
             limit=per_page,
             offset=offset,
+            total_mode=total,
+            cursor=cursor,
+            category_filter=category,
         )
 
+        facet_counts = None
+        if facets:
+            facet_counts = await run_blocking(
+                db.search_facets,
+                [facet.strip() for facet in facets.split(",") if facet.strip()],
+                query=q,
+                trigger_filter=trigger,
+                complexity_filter=complexity,
+                active_only=active_only,
+                category_filter=category,
+            )
+
+        # A full page may have a successor; resume after its last row
+        next_cursor = None
+        if len(workflows) == per_page:
+            next_cursor = encode_cursor(workflows[-1])
+
         # Convert to Pydantic models with error handling
         workflow_summaries = []
         for workflow in workflows:
@@ -275,6 +369,7 @@ async def search_workflows(
                     "tags": workflow.get("tags", []),
                     "created_at": workflow.get("created_at"),
                     "updated_at": workflow.get("updated_at"),
+                    "category": workflow.get("category"),
                 }
                 workflow_summaries.append(WorkflowSummary(**clean_workflow))
             except Exception as e:
@@ -284,11 +379,13 @@ async def search_workflows(
                 # Continue with other workflows instead of failing completely
                 continue
 
-        pages = (total + per_page - 1) // per_page  # Ceiling division
+        pages = None
+        if total_count is not None:
+            pages = (total_count + per_page - 1) // per_page  # Ceiling division
 
         return SearchResponse(
             workflows=workflow_summaries,
-            total=total,
+            total=total_count,
             page=page,
             per_page=per_page,
             pages=pages,
@@ -296,9 +393,14 @@ async def search_workflows(
             filters={
                 "trigger": trigger,
                 "complexity": complexity,
+                "category": category,
                 "active_only": active_only,
             },
+            next_cursor=next_cursor,
+            facets=facet_counts,
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error searching workflows: {str(e)}"
@@ -322,7 +424,9 @@ async def get_workflow_detail(filename: str, request: Request):
             )
 
         # Get workflow metadata from database
-        workflows, _ = db.search_workflows(f'filename:"{filename}"', limit=1)
+        workflows, _ = await run_blocking(
+            db.search_workflows, f'filename:"{filename}"', limit=1
+        )
         if not workflows:
             raise HTTPException(
                 status_code=404, detail="Workflow not found in database"
@@ -331,34 +435,7 @@ async def get_workflow_detail(filename: str, request: Request):
         workflow_meta = workflows[0]
 
         # Load raw JSON from file with security checks
-        workflows_path = Path("workflows").resolve()
-
-        # Find the file safely
-        matching_file = None
-        for subdir in workflows_path.iterdir():
-            if subdir.is_dir():
-                target_file = subdir / filename
-                if target_file.exists() and target_file.is_file():
-                    # Verify the file is actually within workflows directory
-                    try:
-                        target_file.resolve().relative_to(workflows_path)
-                        matching_file = target_file
-                        break
-                    except ValueError:
-                        print(
-                            f"Security: Blocked access to file outside workflows: {target_file}"
-                        )
-                        continue
-
-        if not matching_file:
-            print(f"Warning: File {filename} not found in workflows directory")
-            raise HTTPException(
-                status_code=404,
-                detail=f"Workflow file '{filename}' not found on filesystem",
-            )
-
-        with open(matching_file, "r", encoding="utf-8") as f:
-            raw_json = json.load(f)
+        raw_json = await run_blocking(load_workflow_file, filename)
 
         return {"metadata": workflow_meta, "raw_json": raw_json}
     except HTTPException:
@@ -383,35 +460,16 @@ async def download_workflow(filename: str, request: Request):
                 status_code=429, detail="Rate limit exceeded. Please try again later."
             )
 
-        # Only search within the workflows directory
-        workflows_path = Path("workflows").resolve()  # Get absolute path
-
-        # Find the file safely
-        json_files = []
-        for subdir in workflows_path.iterdir():
-            if subdir.is_dir():
-                target_file = subdir / filename
-                if target_file.exists() and target_file.is_file():
-                    # Verify the file is actually within workflows directory (defense in depth)
-                    try:
-                        target_file.resolve().relative_to(workflows_path)
-                        json_files.append(target_file)
-                    except ValueError:
-                        # File is outside workflows directory
-                        print(
-                            f"Security: Blocked access to file outside workflows: {target_file}"
-                        )
-                        continue
-
-        if not json_files:
+        # Scanning the workflow subdirectories is blocking file I/O
+        file_path = await run_blocking(find_workflow_file, filename)
+        if not file_path:
             print(f"File {filename} not found in workflows directory")
             raise HTTPException(
                 status_code=404, detail=f"Workflow file '{filename}' not found"
             )
 
-        file_path = json_files[0]
-
         # Final security check: Ensure file is within workflows directory
+        workflows_path = Path("workflows").resolve()
         try:
             file_path.resolve().relative_to(workflows_path)
         except ValueError:
@@ -448,43 +506,20 @@ async def get_workflow_diagram(filename: str, request: Request):
                 status_code=429, detail="Rate limit exceeded. Please try again later."
             )
 
-        # Only search within the workflows directory
-        workflows_path = Path("workflows").resolve()
+        # Serve the cached diagram of indexed workflows with an ETag derived
+        # from the content hash; only unindexed files are parsed and rendered
+        cached = await run_blocking(db.get_workflow_diagram, filename)
+        if cached is None:
+            nodes, edges = await run_blocking(load_workflow_graph_from_file, filename)
+            return {"diagram": generate_mermaid_diagram(nodes, edges)}
 
-        # Find the file safely
-        matching_file = None
-        for subdir in workflows_path.iterdir():
-            if subdir.is_dir():
-                target_file = subdir / filename
-                if target_file.exists() and target_file.is_file():
-                    # Verify the file is actually within workflows directory
-                    try:
-                        target_file.resolve().relative_to(workflows_path)
-                        matching_file = target_file
-                        break
-                    except ValueError:
-                        print(
-                            f"Security: Blocked access to file outside workflows: {target_file}"
-                        )
-                        continue
-
-        if not matching_file:
-            print(f"Warning: File {filename} not found in workflows directory")
-            raise HTTPException(
-                status_code=404,
-                detail=f"Workflow file '{filename}' not found on filesystem",
-            )
-
-        with open(matching_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        nodes = data.get("nodes", [])
-        connections = data.get("connections", {})
-
-        # Generate Mermaid diagram
-        diagram = generate_mermaid_diagram(nodes, connections)
+        file_hash, diagram = cached
+        etag = f'"{file_hash}-{DIAGRAM_VERSION}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
 
-        return {"diagram": diagram}
+        return JSONResponse(content={"diagram": diagram}, headers=headers)
     except HTTPException:
         raise
     except json.JSONDecodeError as e:
@@ -499,75 +534,55 @@ async def get_workflow_diagram(filename: str, request: Request):
         )
 
 
-def generate_mermaid_diagram(nodes: List[Dict], connections: Dict) -> str:
-    """Generate Mermaid.js flowchart code from workflow nodes and connections."""
-    if not nodes:
-        return "graph TD\n  EmptyWorkflow[No nodes found in workflow]"
-
-    # Create mapping for node names to ensure valid mermaid IDs
-    mermaid_ids = {}
-    for i, node in enumerate(nodes):
-        node_id = f"node{i}"
-        node_name = node.get("name", f"Node {i}")
-        mermaid_ids[node_name] = node_id
-
-    # Start building the mermaid diagram
-    mermaid_code = ["graph TD"]
-
-    # Add nodes with styling
-    for node in nodes:
-        node_name = node.get("name", "Unnamed")
-        node_id = mermaid_ids[node_name]
-        node_type = node.get("type", "").replace("n8n-nodes-base.", "")
-
-        # Determine node style based on type
-        style = ""
-        if any(x in node_type.lower() for x in ["trigger", "webhook", "cron"]):
-            style = "fill:#b3e0ff,stroke:#0066cc"  # Blue for triggers
-        elif any(x in node_type.lower() for x in ["if", "switch"]):
-            style = "fill:#ffffb3,stroke:#e6e600"  # Yellow for conditional nodes
-        elif any(x in node_type.lower() for x in ["function", "code"]):
-            style = "fill:#d9b3ff,stroke:#6600cc"  # Purple for code nodes
-        elif "error" in node_type.lower():
-            style = "fill:#ffb3b3,stroke:#cc0000"  # Red for error handlers
-        else:
-            style = "fill:#d9d9d9,stroke:#666666"  # Gray for other nodes
-
-        # Add node with label (escaping special characters)
-        clean_name = node_name.replace('"', "'")
-        clean_type = node_type.replace('"', "'")
-        label = f"{clean_name}<br>({clean_type})"
-        mermaid_code.append(f'  {node_id}["{label}"]')
-        mermaid_code.append(f"  style {node_id} {style}")
-
-    # Add connections between nodes
-    for source_name, source_connections in connections.items():
-        if source_name not in mermaid_ids:
-            continue
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(
+        tag.removeprefix("W/") == etag for tag in candidates
+    )
 
-        if isinstance(source_connections, dict) and "main" in source_connections:
-            main_connections = source_connections["main"]
 
-            for i, output_connections in enumerate(main_connections):
-                if not isinstance(output_connections, list):
+def find_workflow_file(filename: str) -> Optional[Path]:
+    """Locate a workflow file inside the workflows directory, or None."""
+    # Only search within the workflows directory
+    workflows_path = Path("workflows").resolve()
+
+    # Find the file safely
+    for subdir in workflows_path.iterdir():
+        if subdir.is_dir():
+            target_file = subdir / filename
+            if target_file.exists() and target_file.is_file():
+                # Verify the file is actually within workflows directory
+                try:
+                    target_file.resolve().relative_to(workflows_path)
+                    return target_file
+                except ValueError:
+                    print(
+                        f"Security: Blocked access to file outside workflows: {target_file}"
+                    )
                     continue
+    return None
 
-                for connection in output_connections:
-                    if not isinstance(connection, dict) or "node" not in connection:
-                        continue
 
-                    target_name = connection["node"]
-                    if target_name not in mermaid_ids:
-                        continue
+def load_workflow_file(filename: str) -> Any:
+    """Find a workflow file under the workflows directory and parse it."""
+    matching_file = find_workflow_file(filename)
+    if not matching_file:
+        print(f"Warning: File {filename} not found in workflows directory")
+        raise HTTPException(
+            status_code=404,
+            detail=f"Workflow file '{filename}' not found on filesystem",
+        )
+
+    return read_json_file(matching_file)
 
-                    # Add arrow with output index if multiple outputs
-                    label = f" -->|{i}| " if len(main_connections) > 1 else " --> "
-                    mermaid_code.append(
-                        f"  {mermaid_ids[source_name]}{label}{mermaid_ids[target_name]}"
-                    )
 
-    # Format the final mermaid diagram code
-    return "\n".join(mermaid_code)
+def load_workflow_graph_from_file(filename: str):
+    """Read nodes and connection edges of a workflow file that is not indexed."""
+    data = load_workflow_file(filename)
+    return data.get("nodes", []), extract_connection_edges(data.get("connections", {}))
 
 
 @app.post("/api/reindex")
@@ -602,9 +617,19 @@ async def reindex_workflows(
         print(f"Security: Unauthorized reindex attempt from {client_ip}")
         raise HTTPException(status_code=401, detail="Invalid authentication token")
 
+    if db.read_only:
+        raise HTTPException(
+            status_code=409,
+            detail="Serving a read-only snapshot. Rebuild it with workflow_db.py --build-snapshot.",
+        )
+
+    if db.is_reindexing():
+        raise HTTPException(status_code=409, detail="A reindex is already running")
+
     def run_indexing():
         try:
-            db.index_all_workflows(force_reindex=force)
+            db.shadow_reindex(force_reindex=force)
+            refresh_suggestion_index()
             print(f"Reindexing completed successfully (requested by {client_ip})")
         except Exception as e:
             print(f"Error during reindexing: {e}")
@@ -613,13 +638,25 @@ async def reindex_workflows(
     return {"message": "Reindexing started in background", "requested_by": client_ip}
 
 
+@app.get("/api/suggest")
+async def suggest(
+    prefix: str = Query(..., min_length=1, max_length=100, description="Typed text"),
+    limit: int = Query(10, ge=1, le=MAX_SUGGESTIONS, description="Completions"),
+):
+    """Typeahead completions over workflow names, integrations and tags."""
+    index = suggestion_index
+    # Indexing outside this process (watch mode, --index) bumps the generation
+    if index is None or index.generation != await run_blocking(db.get_generation):
+        index = await run_blocking(refresh_suggestion_index)
+    return {"prefix": prefix, "suggestions": index.suggest(prefix, limit)}
+
+
 @app.get("/api/integrations")
 async def get_integrations():
-    """Get list of all unique integrations."""
+    """Get all unique integrations with their category and workflow counts."""
     try:
-        stats = db.get_stats()
-        # For now, return basic info. Could be enhanced to return detailed integration stats
-        return {"integrations": [], "count": stats["unique_integrations"]}
+        integrations = await run_blocking(db.get_integration_counts)
+        return {"integrations": integrations, "count": len(integrations)}
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error fetching integrations: {str(e)}"
@@ -633,15 +670,13 @@ async def get_categories():
         # Try to load from the generated unique categories file
         categories_file = Path("context/unique_categories.json")
         if categories_file.exists():
-            with open(categories_file, "r", encoding="utf-8") as f:
-                categories = json.load(f)
+            categories = await run_blocking(read_json_file, categories_file)
             return {"categories": categories}
         else:
             # Fallback: extract categories from search_categories.json
             search_categories_file = Path("context/search_categories.json")
             if search_categories_file.exists():
-                with open(search_categories_file, "r", encoding="utf-8") as f:
-                    search_data = json.load(f)
+                search_data = await run_blocking(read_json_file, search_categories_file)
 
                 unique_categories = set()
                 for item in search_data:
@@ -671,8 +706,7 @@ async def get_category_mappings():
         if not search_categories_file.exists():
             return {"mappings": {}}
 
-        with open(search_categories_file, "r", encoding="utf-8") as f:
-            search_data = json.load(f)
+        search_data = await run_blocking(read_json_file, search_categories_file)
 
         # Convert to a simple filename -> category mapping
         mappings = {}
@@ -696,15 +730,33 @@ async def search_workflows_by_category(
     category: str,
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
+    total: Literal["exact", "estimate", "none"] = Query(
+        "exact",
+        description="exact counts all matches, estimate only reports whether "
+        "another page exists, none skips counting",
+    ),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor from the previous page; replaces page offsets"
+    ),
 ):
     """Search workflows by service category (messaging, database, ai_ml, etc.)."""
     try:
         offset = (page - 1) * per_page
 
-        workflows, total = db.search_by_category(
-            category=category, limit=per_page, offset=offset
+        workflows, total_count = await run_blocking(
+            db.search_by_category,
+            category=category,
+            limit=per_page,
+            offset=offset,
+            total_mode=total,
+            cursor=cursor,
         )
 
+        # A full page may have a successor; resume after its last row
+        next_cursor = None
+        if len(workflows) == per_page:
+            next_cursor = encode_cursor(workflows[-1])
+
         # Convert to Pydantic models with error handling
         workflow_summaries = []
         for workflow in workflows:
@@ -722,6 +774,7 @@ async def search_workflows_by_category(
                     "tags": workflow.get("tags", []),
                     "created_at": workflow.get("created_at"),
                     "updated_at": workflow.get("updated_at"),
+                    "category": workflow.get("category"),
                 }
                 workflow_summaries.append(WorkflowSummary(**clean_workflow))
             except Exception as e:
@@ -730,17 +783,22 @@ async def search_workflows_by_category(
                 )
                 continue
 
-        pages = (total + per_page - 1) // per_page
+        pages = None
+        if total_count is not None:
+            pages = (total_count + per_page - 1) // per_page
 
         return SearchResponse(
             workflows=workflow_summaries,
-            total=total,
+            total=total_count,
             page=page,
             per_page=per_page,
             pages=pages,
             query=f"category:{category}",
             filters={"category": category},
+            next_cursor=next_cursor,
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error searching by category: {str(e)}"
@@ -771,7 +829,9 @@ def create_static_directory():
     return static_dir
 
 
-def run_server(host: str = "127.0.0.1", port: int = 8000, reload: bool = False):
+def run_server(
+    host: str = "127.0.0.1", port: int = 8000, reload: bool = False, watch: bool = False
+):
     """Run the FastAPI server."""
     # Ensure static directory exists
     create_static_directory()
@@ -803,6 +863,11 @@ def run_server(host: str = "127.0.0.1", port: int = 8000, reload: bool = False):
     else:
         print(f"❌ Static directory not found at: {static_path.absolute()}")
 
+    if watch:
+        from workflow_watch import WorkflowWatcher
+
+        WorkflowWatcher(db).start()
+
     print("🚀 Starting N8N Workflow Documentation API")
     print(f"📊 Database contains {stats['total']} workflows")
     print(f"🌐 Server will be available at: http://{host}:{port}")
@@ -829,7 +894,12 @@ if __name__ == "__main__":
     parser.add_argument(
         "--reload", action="store_true", help="Enable auto-reload for development"
     )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Watch the workflows directory and reindex changed files",
+    )
 
     args = parser.parse_args()
 
-    run_server(host=args.host, port=args.port, reload=args.reload)
+    run_server(host=args.host, port=args.port, reload=args.reload, watch=args.watch)
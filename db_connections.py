@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Shared SQLite Connections
+Pooled read connections and a single writer connection per database file.
+"""
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+# Reader tuning: memory-map the file and keep a warm page cache per connection
+MMAP_SIZE = 256 * 1024 * 1024
+CACHE_SIZE_KB = 16 * 1024
+
+
+class ConnectionManager:
+    """Reusable SQLite connections for one database file.
+
+    Readers borrow a connection from a bounded pool; each is opened once with
+    ``mmap_size``, ``cache_size`` and ``query_only`` so the page cache and
+    parsed schema survive between requests. All writes go through one
+    dedicated writer connection, serialized by a lock. Pass one manager to
+    every service that uses the same file.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_readers: int = 8,
+        read_only: bool = False,
+        timeout: float = 30.0,
+    ):
+        self.db_path = db_path
+        self.max_readers = max_readers
+        self.read_only = read_only
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_readers)
+        self._writer: Optional[sqlite3.Connection] = None
+        self._writer_lock = threading.RLock()
+
+    def _open(self, query_only: bool) -> sqlite3.Connection:
+        if self.read_only:
+            # Prebuilt snapshots never change, so skip locking entirely
+            uri = Path(self.db_path).resolve().as_uri() + "?mode=ro&immutable=1"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(
+                self.db_path, timeout=self.timeout, check_same_thread=False
+            )
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KB}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        if query_only:
+            conn.execute("PRAGMA query_only=ON")
+        return conn
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a pooled read-only connection, waiting if all are in use."""
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._open(query_only=True)
+            try:
+                yield conn
+            finally:
+                conn.row_factory = None
+                if conn.in_transaction:
+                    conn.rollback()
+                self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def writer(self, timeout: float = -1) -> Iterator[sqlite3.Connection]:
+        """Hold the writer connection; commits on success, rolls back on error.
+
+        ``timeout`` bounds the wait for another thread's write in seconds
+        (-1 waits indefinitely); sqlite3.OperationalError is raised when it
+        expires.
+        """
+        if self.read_only:
+            raise sqlite3.OperationalError(f"{self.db_path} is opened read-only")
+        if not self._writer_lock.acquire(timeout=timeout):
+            raise sqlite3.OperationalError("database writer is busy")
+        try:
+            if self._writer is None:
+                self._writer = self._open(query_only=False)
+            conn = self._writer
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                conn.row_factory = None
+        finally:
+            self._writer_lock.release()
+
+    def close(self):
+        """Close the idle readers and the writer connection."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._writer_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
@@ -53,9 +53,18 @@ def setup_directories():
     print("✅ Directories verified")
 
 
-def setup_database(force_reindex: bool = False, skip_index: bool = False) -> str:
+def setup_database(
+    force_reindex: bool = False, skip_index: bool = False, workers: int = 1
+) -> str:
     """Setup and initialize the database."""
-    from workflow_db import WorkflowDatabase
+    from workflow_db import WorkflowDatabase, is_snapshot
+
+    # Prefer an index baked into the image with `workflow_db.py --build-snapshot`
+    snapshot_path = os.environ.get("WORKFLOW_SNAPSHOT_PATH")
+    if snapshot_path and is_snapshot(snapshot_path) and not force_reindex:
+        stats = WorkflowDatabase(snapshot_path).get_stats()
+        print(f"✅ Using prebuilt snapshot {snapshot_path}: {stats['total']} workflows")
+        return snapshot_path
 
     db_path = "database/workflows.db"
 
@@ -73,7 +82,7 @@ def setup_database(force_reindex: bool = False, skip_index: bool = False) -> str
     stats = db.get_stats()
     if stats["total"] == 0 or force_reindex:
         print("📚 Indexing workflows...")
-        index_stats = db.index_all_workflows(force_reindex=True)
+        index_stats = db.index_all_workflows(force_reindex=True, workers=workers)
         print(f"✅ Indexed {index_stats['processed']} workflows")
 
         # Show final stats
@@ -85,7 +94,13 @@ def setup_database(force_reindex: bool = False, skip_index: bool = False) -> str
     return db_path
 
 
-def start_server(host: str = "127.0.0.1", port: int = 8000, reload: bool = False):
+def start_server(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    reload: bool = False,
+    watch: bool = False,
+    db_path: str = "database/workflows.db",
+):
     """Start the FastAPI server."""
     print(f"🌐 Starting server at http://{host}:{port}")
     print(f"📊 API Documentation: http://{host}:{port}/docs")
@@ -95,7 +110,17 @@ def start_server(host: str = "127.0.0.1", port: int = 8000, reload: bool = False
     print("-" * 50)
 
     # Configure database path
-    os.environ["WORKFLOW_DB_PATH"] = "database/workflows.db"
+    os.environ["WORKFLOW_DB_PATH"] = db_path
+
+    if watch:
+        from workflow_db import WorkflowDatabase
+        from workflow_watch import WorkflowWatcher
+
+        db = WorkflowDatabase(db_path)
+        if db.read_only:
+            print("⚠️  Watch mode disabled: serving a read-only snapshot")
+        else:
+            WorkflowWatcher(db).start()
 
     # Start uvicorn with better configuration
     import uvicorn
@@ -122,7 +147,9 @@ Examples:
   python run.py --port 3000        # Start on port 3000
   python run.py --host 0.0.0.0     # Accept external connections
   python run.py --reindex          # Force database reindexing
+  python run.py --reindex --jobs 0 # Reindex using every CPU core
   python run.py --dev              # Development mode with auto-reload
+  python run.py --watch            # Reindex workflows as files change
         """,
     )
 
@@ -135,9 +162,20 @@ Examples:
     parser.add_argument(
         "--reindex", action="store_true", help="Force database reindexing"
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for indexing (0 = all cores, default: 1)",
+    )
     parser.add_argument(
         "--dev", action="store_true", help="Development mode with auto-reload"
     )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Watch the workflows directory and reindex changed files",
+    )
     parser.add_argument(
         "--skip-index",
         action="store_true",
@@ -161,14 +199,22 @@ Examples:
 
     # Setup database
     try:
-        setup_database(force_reindex=args.reindex, skip_index=skip_index)
+        db_path = setup_database(
+            force_reindex=args.reindex, skip_index=skip_index, workers=args.jobs
+        )
     except Exception as e:
         print(f"❌ Database setup error: {e}")
         sys.exit(1)
 
     # Start server
     try:
-        start_server(host=args.host, port=args.port, reload=args.dev)
+        start_server(
+            host=args.host,
+            port=args.port,
+            reload=args.dev,
+            watch=args.watch,
+            db_path=db_path,
+        )
     except KeyboardInterrupt:
         print("\n👋 Server stopped!")
     except Exception as e:
@@ -10,6 +10,12 @@ from pydantic import BaseModel
 from typing import List, Dict, Optional
 import json
 import sqlite3
+from contextlib import contextmanager
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from db_connections import ConnectionManager  # noqa: E402
 
 
 class ChatMessage(BaseModel):
@@ -25,60 +31,64 @@ class AIResponse(BaseModel):
 
 
 class WorkflowAssistant:
-    def __init__(self, db_path: str = "workflows.db"):
-        self.db_path = db_path
+    def __init__(
+        self,
+        db_path: str = "workflows.db",
+        connections: Optional[ConnectionManager] = None,
+    ):
+        self.connections = connections or ConnectionManager(db_path)
+        self.db_path = self.connections.db_path
         self.conversation_history = {}
 
+    @contextmanager
     def get_db_connection(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        with self.connections.reader() as conn:
+            conn.row_factory = sqlite3.Row
+            yield conn
 
     def search_workflows_intelligent(self, query: str, limit: int = 5) -> List[Dict]:
         """Intelligent workflow search based on natural language query."""
-        conn = self.get_db_connection()
-
-        # Extract keywords and intent from query
-        keywords = self.extract_keywords(query)
-        intent = self.detect_intent(query)
+        with self.get_db_connection() as conn:
+            # Extract keywords and intent from query
+            keywords = self.extract_keywords(query)
+            intent = self.detect_intent(query)
+
+            # Build search query
+            search_terms = []
+            for keyword in keywords:
+                search_terms.append(
+                    f"name LIKE '%{keyword}%' OR description LIKE '%{keyword}%'"
+                )
 
-        # Build search query
-        search_terms = []
-        for keyword in keywords:
-            search_terms.append(
-                f"name LIKE '%{keyword}%' OR description LIKE '%{keyword}%'"
-            )
+            where_clause = " OR ".join(search_terms) if search_terms else "1=1"
 
-        where_clause = " OR ".join(search_terms) if search_terms else "1=1"
+            # Add intent-based filtering
+            if intent == "automation":
+                where_clause += (
+                    " AND (trigger_type = 'Scheduled' OR trigger_type = 'Complex')"
+                )
+            elif intent == "integration":
+                where_clause += " AND trigger_type = 'Webhook'"
+            elif intent == "manual":
+                where_clause += " AND trigger_type = 'Manual'"
+
+            query_sql = f"""
+                SELECT * FROM workflows 
+                WHERE {where_clause}
+                ORDER BY 
+                    CASE WHEN active = 1 THEN 1 ELSE 2 END,
+                    node_count DESC
+                LIMIT {limit}
+            """
+
+            cursor = conn.execute(query_sql)
+            workflows = []
+            for row in cursor.fetchall():
+                workflow = dict(row)
+                workflow["integrations"] = json.loads(workflow["integrations"] or "[]")
+                workflow["tags"] = json.loads(workflow["tags"] or "[]")
+                workflows.append(workflow)
 
-        # Add intent-based filtering
-        if intent == "automation":
-            where_clause += (
-                " AND (trigger_type = 'Scheduled' OR trigger_type = 'Complex')"
-            )
-        elif intent == "integration":
-            where_clause += " AND trigger_type = 'Webhook'"
-        elif intent == "manual":
-            where_clause += " AND trigger_type = 'Manual'"
-
-        query_sql = f"""
-            SELECT * FROM workflows 
-            WHERE {where_clause}
-            ORDER BY 
-                CASE WHEN active = 1 THEN 1 ELSE 2 END,
-                node_count DESC
-            LIMIT {limit}
-        """
-
-        cursor = conn.execute(query_sql)
-        workflows = []
-        for row in cursor.fetchall():
-            workflow = dict(row)
-            workflow["integrations"] = json.loads(workflow["integrations"] or "[]")
-            workflow["tags"] = json.loads(workflow["tags"] or "[]")
-            workflows.append(workflow)
-
-        conn.close()
         return workflows
 
     def extract_keywords(self, query: str) -> List[str]:
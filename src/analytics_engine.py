@@ -7,11 +7,17 @@ Provides insights, patterns, and usage analytics.
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.responses import HTMLResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import sqlite3
+from contextlib import contextmanager
 import json
 from datetime import datetime
 from collections import Counter, defaultdict
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from db_connections import ConnectionManager  # noqa: E402
 
 
 class AnalyticsResponse(BaseModel):
@@ -23,85 +29,88 @@ class AnalyticsResponse(BaseModel):
 
 
 class WorkflowAnalytics:
-    def __init__(self, db_path: str = "workflows.db"):
-        self.db_path = db_path
+    def __init__(
+        self,
+        db_path: str = "workflows.db",
+        connections: Optional[ConnectionManager] = None,
+    ):
+        self.connections = connections or ConnectionManager(db_path)
+        self.db_path = self.connections.db_path
 
+    @contextmanager
     def get_db_connection(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        with self.connections.reader() as conn:
+            conn.row_factory = sqlite3.Row
+            yield conn
 
     def get_workflow_analytics(self) -> Dict[str, Any]:
         """Get comprehensive workflow analytics."""
-        conn = self.get_db_connection()
-
-        # Basic statistics
-        cursor = conn.execute("SELECT COUNT(*) as total FROM workflows")
-        total_workflows = cursor.fetchone()["total"]
-
-        cursor = conn.execute(
-            "SELECT COUNT(*) as active FROM workflows WHERE active = 1"
-        )
-        active_workflows = cursor.fetchone()["active"]
-
-        # Trigger type distribution
-        cursor = conn.execute("""
-            SELECT trigger_type, COUNT(*) as count 
-            FROM workflows 
-            GROUP BY trigger_type 
-            ORDER BY count DESC
-        """)
-        trigger_distribution = {
-            row["trigger_type"]: row["count"] for row in cursor.fetchall()
-        }
-
-        # Complexity distribution
-        cursor = conn.execute("""
-            SELECT complexity, COUNT(*) as count 
-            FROM workflows 
-            GROUP BY complexity 
-            ORDER BY count DESC
-        """)
-        complexity_distribution = {
-            row["complexity"]: row["count"] for row in cursor.fetchall()
-        }
-
-        # Node count statistics
-        cursor = conn.execute("""
-            SELECT 
-                AVG(node_count) as avg_nodes,
-                MIN(node_count) as min_nodes,
-                MAX(node_count) as max_nodes,
-                COUNT(*) as total
-            FROM workflows
-        """)
-        node_stats = dict(cursor.fetchone())
-
-        # Integration analysis
-        cursor = conn.execute(
-            "SELECT integrations FROM workflows WHERE integrations IS NOT NULL"
-        )
-        all_integrations = []
-        for row in cursor.fetchall():
-            integrations = json.loads(row["integrations"] or "[]")
-            all_integrations.extend(integrations)
+        with self.get_db_connection() as conn:
+            # Basic statistics
+            cursor = conn.execute("SELECT COUNT(*) as total FROM workflows")
+            total_workflows = cursor.fetchone()["total"]
 
-        integration_counts = Counter(all_integrations)
-        top_integrations = dict(integration_counts.most_common(10))
-
-        # Workflow patterns
-        patterns = self.analyze_workflow_patterns(conn)
+            cursor = conn.execute(
+                "SELECT COUNT(*) as active FROM workflows WHERE active = 1"
+            )
+            active_workflows = cursor.fetchone()["active"]
+
+            # Trigger type distribution
+            cursor = conn.execute("""
+                SELECT trigger_type, COUNT(*) as count 
+                FROM workflows 
+                GROUP BY trigger_type 
+                ORDER BY count DESC
+            """)
+            trigger_distribution = {
+                row["trigger_type"]: row["count"] for row in cursor.fetchall()
+            }
 
-        # Recommendations
-        recommendations = self.generate_recommendations(
-            total_workflows,
-            active_workflows,
-            trigger_distribution,
-            complexity_distribution,
-            top_integrations,
-        )
+            # Complexity distribution
+            cursor = conn.execute("""
+                SELECT complexity, COUNT(*) as count 
+                FROM workflows 
+                GROUP BY complexity 
+                ORDER BY count DESC
+            """)
+            complexity_distribution = {
+                row["complexity"]: row["count"] for row in cursor.fetchall()
+            }
 
-        conn.close()
+            # Node count statistics
+            cursor = conn.execute("""
+                SELECT 
+                    AVG(node_count) as avg_nodes,
+                    MIN(node_count) as min_nodes,
+                    MAX(node_count) as max_nodes,
+                    COUNT(*) as total
+                FROM workflows
+            """)
+            node_stats = dict(cursor.fetchone())
+
+            # Integration analysis
+            cursor = conn.execute(
+                "SELECT integrations FROM workflows WHERE integrations IS NOT NULL"
+            )
+            all_integrations = []
+            for row in cursor.fetchall():
+                integrations = json.loads(row["integrations"] or "[]")
+                all_integrations.extend(integrations)
+
+            integration_counts = Counter(all_integrations)
+            top_integrations = dict(integration_counts.most_common(10))
+
+            # Workflow patterns
+            patterns = self.analyze_workflow_patterns(conn)
+
+            # Recommendations
+            recommendations = self.generate_recommendations(
+                total_workflows,
+                active_workflows,
+                trigger_distribution,
+                complexity_distribution,
+                top_integrations,
+            )
 
         return {
             "overview": {
@@ -293,40 +302,39 @@ class WorkflowAnalytics:
 
     def get_usage_insights(self) -> Dict[str, Any]:
         """Get usage insights and patterns."""
-        conn = self.get_db_connection()
-
-        # Active vs inactive analysis
-        cursor = conn.execute("""
-            SELECT 
-                trigger_type,
-                complexity,
-                COUNT(*) as total,
-                SUM(active) as active_count
-            FROM workflows 
-            GROUP BY trigger_type, complexity
-        """)
-
-        usage_patterns = []
-        for row in cursor.fetchall():
-            activation_rate = (
-                (row["active_count"] / row["total"]) * 100 if row["total"] > 0 else 0
-            )
-            usage_patterns.append(
-                {
-                    "trigger_type": row["trigger_type"],
-                    "complexity": row["complexity"],
-                    "total_workflows": row["total"],
-                    "active_workflows": row["active_count"],
-                    "activation_rate": round(activation_rate, 2),
-                }
-            )
-
-        # Most effective patterns
-        effective_patterns = sorted(
-            usage_patterns, key=lambda x: x["activation_rate"], reverse=True
-        )[:5]
+        with self.get_db_connection() as conn:
+            # Active vs inactive analysis
+            cursor = conn.execute("""
+                SELECT 
+                    trigger_type,
+                    complexity,
+                    COUNT(*) as total,
+                    SUM(active) as active_count
+                FROM workflows 
+                GROUP BY trigger_type, complexity
+            """)
+
+            usage_patterns = []
+            for row in cursor.fetchall():
+                activation_rate = (
+                    (row["active_count"] / row["total"]) * 100
+                    if row["total"] > 0
+                    else 0
+                )
+                usage_patterns.append(
+                    {
+                        "trigger_type": row["trigger_type"],
+                        "complexity": row["complexity"],
+                        "total_workflows": row["total"],
+                        "active_workflows": row["active_count"],
+                        "activation_rate": round(activation_rate, 2),
+                    }
+                )
 
-        conn.close()
+            # Most effective patterns
+            effective_patterns = sorted(
+                usage_patterns, key=lambda x: x["activation_rate"], reverse=True
+            )[:5]
 
         return {
             "usage_patterns": usage_patterns,
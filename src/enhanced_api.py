@@ -4,7 +4,6 @@ Enhanced API Module for n8n Workflows Repository
 Advanced features, analytics, and performance optimizations
 """
 
-import sqlite3
 import time
 from datetime import datetime
 from typing import Dict, List, Optional
@@ -13,9 +12,18 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel
 import uvicorn
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from db_connections import ConnectionManager  # noqa: E402
+from workflow_db import trigram_match  # noqa: E402
 
 # Import community features
-from community_features import CommunityFeatures, create_community_api_endpoints
+from community_features import (  # noqa: E402
+    CommunityFeatures,
+    create_community_api_endpoints,
+)
 
 
 class WorkflowSearchRequest(BaseModel):
@@ -50,10 +58,15 @@ class AnalyticsRequest(BaseModel):
 class EnhancedAPI:
     """Enhanced API with advanced features"""
 
-    def __init__(self, db_path: str = "workflows.db"):
+    def __init__(
+        self,
+        db_path: str = "workflows.db",
+        connections: Optional[ConnectionManager] = None,
+    ):
         """Initialize enhanced API"""
-        self.db_path = db_path
-        self.community = CommunityFeatures(db_path)
+        self.connections = connections or ConnectionManager(db_path)
+        self.db_path = self.connections.db_path
+        self.community = CommunityFeatures(connections=self.connections)
         self.app = FastAPI(
             title="N8N Workflows Enhanced API",
             description="Advanced API for n8n workflows repository with community features",
@@ -231,87 +244,99 @@ class EnhancedAPI:
 
     def _search_workflows_enhanced(self, **kwargs) -> List[Dict]:
         """Enhanced workflow search with multiple filters"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Build dynamic query
-        query_parts = ["SELECT w.*, ws.average_rating, ws.total_ratings"]
-        query_parts.append("FROM workflows w")
-        query_parts.append("LEFT JOIN workflow_stats ws ON w.filename = ws.workflow_id")
-
-        conditions = []
-        params = []
-
-        # Apply filters
-        if kwargs.get("search"):
-            conditions.append(
-                "(w.name LIKE ? OR w.description LIKE ? OR w.integrations LIKE ?)"
-            )
-            search_term = f"%{kwargs['search']}%"
-            params.extend([search_term, search_term, search_term])
-
-        if kwargs.get("category"):
-            conditions.append("w.category = ?")
-            params.append(kwargs["category"])
-
-        if kwargs.get("trigger_type"):
-            conditions.append("w.trigger_type = ?")
-            params.append(kwargs["trigger_type"])
-
-        if kwargs.get("complexity"):
-            conditions.append("w.complexity = ?")
-            params.append(kwargs["complexity"])
-
-        if kwargs.get("integration"):
-            conditions.append("w.integrations LIKE ?")
-            params.append(f"%{kwargs['integration']}%")
-
-        if kwargs.get("min_rating"):
-            conditions.append("ws.average_rating >= ?")
-            params.append(kwargs["min_rating"])
-
-        # Add conditions to query
-        if conditions:
-            query_parts.append("WHERE " + " AND ".join(conditions))
-
-        # Add sorting
-        sort_by = kwargs.get("sort_by", "name")
-        sort_order = kwargs.get("sort_order", "asc").upper()
-        query_parts.append(f"ORDER BY {sort_by} {sort_order}")
-
-        # Add pagination
-        query_parts.append("LIMIT ? OFFSET ?")
-        params.extend([kwargs.get("limit", 20), kwargs.get("offset", 0)])
-
-        # Execute query
-        query = " ".join(query_parts)
-        cursor.execute(query, params)
-
-        workflows = []
-        for row in cursor.fetchall():
-            workflows.append(
-                {
-                    "filename": row[0],
-                    "name": row[1],
-                    "workflow_id": row[2],
-                    "active": bool(row[3]),
-                    "description": row[4],
-                    "trigger_type": row[5],
-                    "complexity": row[6],
-                    "node_count": row[7],
-                    "integrations": row[8],
-                    "tags": row[9],
-                    "created_at": row[10],
-                    "updated_at": row[11],
-                    "file_hash": row[12],
-                    "file_size": row[13],
-                    "analyzed_at": row[14],
-                    "average_rating": row[15],
-                    "total_ratings": row[16],
-                }
+        with self.connections.reader() as conn:
+            cursor = conn.cursor()
+
+            # Build dynamic query
+            query_parts = ["SELECT w.*, ws.average_rating, ws.total_ratings"]
+            query_parts.append("FROM workflows w")
+            query_parts.append(
+                "LEFT JOIN workflow_stats ws ON w.filename = ws.workflow_id"
             )
 
-        conn.close()
+            conditions = []
+            params = []
+
+            # Apply filters
+            if kwargs.get("search"):
+                substring = trigram_match(kwargs["search"])
+                if substring is not None:
+                    # Substring lookup through the trigram index instead of
+                    # scanning every row
+                    conditions.append(
+                        "w.id IN (SELECT rowid FROM workflows_trigram "
+                        "WHERE workflows_trigram MATCH ?)"
+                    )
+                    params.append(substring)
+                else:
+                    conditions.append(
+                        "(w.name LIKE ? OR w.description LIKE ? "
+                        "OR w.integrations LIKE ?)"
+                    )
+                    search_term = f"%{kwargs['search']}%"
+                    params.extend([search_term, search_term, search_term])
+
+            if kwargs.get("category"):
+                conditions.append("w.category = ?")
+                params.append(kwargs["category"])
+
+            if kwargs.get("trigger_type"):
+                conditions.append("w.trigger_type = ?")
+                params.append(kwargs["trigger_type"])
+
+            if kwargs.get("complexity"):
+                conditions.append("w.complexity = ?")
+                params.append(kwargs["complexity"])
+
+            if kwargs.get("integration"):
+                conditions.append("w.integrations LIKE ?")
+                params.append(f"%{kwargs['integration']}%")
+
+            if kwargs.get("min_rating"):
+                conditions.append("ws.average_rating >= ?")
+                params.append(kwargs["min_rating"])
+
+            # Add conditions to query
+            if conditions:
+                query_parts.append("WHERE " + " AND ".join(conditions))
+
+            # Add sorting
+            sort_by = kwargs.get("sort_by", "name")
+            sort_order = kwargs.get("sort_order", "asc").upper()
+            query_parts.append(f"ORDER BY {sort_by} {sort_order}")
+
+            # Add pagination
+            query_parts.append("LIMIT ? OFFSET ?")
+            params.extend([kwargs.get("limit", 20), kwargs.get("offset", 0)])
+
+            # Execute query
+            query = " ".join(query_parts)
+            cursor.execute(query, params)
+
+            workflows = []
+            for row in cursor.fetchall():
+                workflows.append(
+                    {
+                        "filename": row[0],
+                        "name": row[1],
+                        "workflow_id": row[2],
+                        "active": bool(row[3]),
+                        "description": row[4],
+                        "trigger_type": row[5],
+                        "complexity": row[6],
+                        "node_count": row[7],
+                        "integrations": row[8],
+                        "tags": row[9],
+                        "created_at": row[10],
+                        "updated_at": row[11],
+                        "file_hash": row[12],
+                        "file_size": row[13],
+                        "analyzed_at": row[14],
+                        "average_rating": row[15],
+                        "total_ratings": row[16],
+                    }
+                )
+
         return workflows
 
     def _advanced_search(self, request: WorkflowSearchRequest) -> List[Dict]:
@@ -337,51 +362,49 @@ class EnhancedAPI:
         include_related: bool,
     ) -> Dict:
         """Get detailed workflow information"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Get basic workflow data
-        cursor.execute("SELECT * FROM workflows WHERE filename = ?", (workflow_id,))
-        workflow_row = cursor.fetchone()
-
-        if not workflow_row:
-            conn.close()
-            return None
-
-        workflow_data = {
-            "filename": workflow_row[0],
-            "name": workflow_row[1],
-            "workflow_id": workflow_row[2],
-            "active": bool(workflow_row[3]),
-            "description": workflow_row[4],
-            "trigger_type": workflow_row[5],
-            "complexity": workflow_row[6],
-            "node_count": workflow_row[7],
-            "integrations": workflow_row[8],
-            "tags": workflow_row[9],
-            "created_at": workflow_row[10],
-            "updated_at": workflow_row[11],
-            "file_hash": workflow_row[12],
-            "file_size": workflow_row[13],
-            "analyzed_at": workflow_row[14],
-        }
-
-        # Add statistics if requested
-        if include_stats:
-            stats = self.community.get_workflow_stats(workflow_id)
-            workflow_data["stats"] = stats.__dict__ if stats else None
-
-        # Add ratings if requested
-        if include_ratings:
-            ratings = self.community.get_workflow_ratings(workflow_id, 5)
-            workflow_data["ratings"] = [rating.__dict__ for rating in ratings]
+        with self.connections.reader() as conn:
+            cursor = conn.cursor()
+
+            # Get basic workflow data
+            cursor.execute("SELECT * FROM workflows WHERE filename = ?", (workflow_id,))
+            workflow_row = cursor.fetchone()
+
+            if not workflow_row:
+                return None
+
+            workflow_data = {
+                "filename": workflow_row[0],
+                "name": workflow_row[1],
+                "workflow_id": workflow_row[2],
+                "active": bool(workflow_row[3]),
+                "description": workflow_row[4],
+                "trigger_type": workflow_row[5],
+                "complexity": workflow_row[6],
+                "node_count": workflow_row[7],
+                "integrations": workflow_row[8],
+                "tags": workflow_row[9],
+                "created_at": workflow_row[10],
+                "updated_at": workflow_row[11],
+                "file_hash": workflow_row[12],
+                "file_size": workflow_row[13],
+                "analyzed_at": workflow_row[14],
+            }
+
+            # Add statistics if requested
+            if include_stats:
+                stats = self.community.get_workflow_stats(workflow_id)
+                workflow_data["stats"] = stats.__dict__ if stats else None
+
+            # Add ratings if requested
+            if include_ratings:
+                ratings = self.community.get_workflow_ratings(workflow_id, 5)
+                workflow_data["ratings"] = [rating.__dict__ for rating in ratings]
+
+            # Add related workflows if requested
+            if include_related:
+                related = self._get_related_workflows(workflow_id)
+                workflow_data["related_workflows"] = related
 
-        # Add related workflows if requested
-        if include_related:
-            related = self._get_related_workflows(workflow_id)
-            workflow_data["related_workflows"] = related
-
-        conn.close()
         return workflow_data
 
     def _get_recommendations(
@@ -390,32 +413,31 @@ class EnhancedAPI:
         """Get personalized workflow recommendations"""
         # Implementation for recommendation algorithm
         # This would use collaborative filtering, content-based filtering, etc.
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Simple recommendation based on user interests
-        recommendations = []
-        for interest in request.user_interests:
-            cursor.execute(
-                """
-                SELECT * FROM workflows 
-                WHERE integrations LIKE ? OR name LIKE ? OR description LIKE ?
-                LIMIT 5
-            """,
-                (f"%{interest}%", f"%{interest}%", f"%{interest}%"),
-            )
-
-            for row in cursor.fetchall():
-                recommendations.append(
-                    {
-                        "filename": row[0],
-                        "name": row[1],
-                        "description": row[4],
-                        "reason": f"Matches your interest in {interest}",
-                    }
+        with self.connections.reader() as conn:
+            cursor = conn.cursor()
+
+            # Simple recommendation based on user interests
+            recommendations = []
+            for interest in request.user_interests:
+                cursor.execute(
+                    """
+                    SELECT * FROM workflows 
+                    WHERE integrations LIKE ? OR name LIKE ? OR description LIKE ?
+                    LIMIT 5
+                """,
+                    (f"%{interest}%", f"%{interest}%", f"%{interest}%"),
                 )
 
-        conn.close()
+                for row in cursor.fetchall():
+                    recommendations.append(
+                        {
+                            "filename": row[0],
+                            "name": row[1],
+                            "description": row[4],
+                            "reason": f"Matches your interest in {interest}",
+                        }
+                    )
+
         return recommendations[: request.limit]
 
     def _get_trending_workflows(self, limit: int) -> List[Dict]:
@@ -424,26 +446,24 @@ class EnhancedAPI:
 
     def _get_analytics_overview(self) -> Dict:
         """Get analytics overview"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Total workflows
-        cursor.execute("SELECT COUNT(*) FROM workflows")
-        total_workflows = cursor.fetchone()[0]
+        with self.connections.reader() as conn:
+            cursor = conn.cursor()
 
-        # Active workflows
-        cursor.execute("SELECT COUNT(*) FROM workflows WHERE active = 1")
-        active_workflows = cursor.fetchone()[0]
+            # Total workflows
+            cursor.execute("SELECT COUNT(*) FROM workflows")
+            total_workflows = cursor.fetchone()[0]
 
-        # Categories
-        cursor.execute("SELECT category, COUNT(*) FROM workflows GROUP BY category")
-        categories = dict(cursor.fetchall())
+            # Active workflows
+            cursor.execute("SELECT COUNT(*) FROM workflows WHERE active = 1")
+            active_workflows = cursor.fetchone()[0]
 
-        # Integrations
-        cursor.execute("SELECT COUNT(DISTINCT integrations) FROM workflows")
-        unique_integrations = cursor.fetchone()[0]
+            # Categories
+            cursor.execute("SELECT category, COUNT(*) FROM workflows GROUP BY category")
+            categories = dict(cursor.fetchall())
 
-        conn.close()
+            # Integrations
+            cursor.execute("SELECT COUNT(DISTINCT integrations) FROM workflows")
+            unique_integrations = cursor.fetchone()[0]
 
         return {
             "total_workflows": total_workflows,
@@ -465,20 +485,18 @@ class EnhancedAPI:
 
     def _get_health_status(self) -> Dict:
         """Get health status and performance metrics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self.connections.reader() as conn:
+            cursor = conn.cursor()
 
-        # Database health
-        cursor.execute("SELECT COUNT(*) FROM workflows")
-        total_workflows = cursor.fetchone()[0]
+            # Database health
+            cursor.execute("SELECT COUNT(*) FROM workflows")
+            total_workflows = cursor.fetchone()[0]
 
-        # Performance test
-        start_time = time.time()
-        cursor.execute("SELECT COUNT(*) FROM workflows WHERE active = 1")
-        active_count = cursor.fetchone()[0]
-        query_time = (time.time() - start_time) * 1000
-
-        conn.close()
+            # Performance test
+            start_time = time.time()
+            cursor.execute("SELECT COUNT(*) FROM workflows WHERE active = 1")
+            active_count = cursor.fetchone()[0]
+            query_time = (time.time() - start_time) * 1000
 
         return {
             "status": "healthy",
@@ -497,39 +515,44 @@ class EnhancedAPI:
 
     def _get_related_workflows(self, workflow_id: str, limit: int = 5) -> List[Dict]:
         """Get related workflows based on similar integrations or categories"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self.connections.reader() as conn:
+            cursor = conn.cursor()
 
-        # Get current workflow details
-        cursor.execute(
-            "SELECT integrations, category FROM workflows WHERE filename = ?",
-            (workflow_id,),
-        )
-        current_workflow = cursor.fetchone()
-
-        if not current_workflow:
-            conn.close()
-            return []
-
-        current_integrations = current_workflow[0] or ""
-        current_category = current_workflow[1] or ""
-
-        # Find related workflows
-        cursor.execute(
-            """
-            SELECT filename, name, description FROM workflows 
-            WHERE filename != ? 
-            AND (integrations LIKE ? OR category = ?)
-            LIMIT ?
-        """,
-            (workflow_id, f"%{current_integrations[:50]}%", current_category, limit),
-        )
+            # Get current workflow details
+            cursor.execute(
+                "SELECT integrations, category FROM workflows WHERE filename = ?",
+                (workflow_id,),
+            )
+            current_workflow = cursor.fetchone()
+
+            if not current_workflow:
+                return []
+
+            current_integrations = current_workflow[0] or ""
+            current_category = current_workflow[1] or ""
+
+            # Find related workflows
+            cursor.execute(
+                """
+                SELECT filename, name, description FROM workflows 
+                WHERE filename != ? 
+                AND (integrations LIKE ? OR category = ?)
+                LIMIT ?
+            """,
+                (
+                    workflow_id,
+                    f"%{current_integrations[:50]}%",
+                    current_category,
+                    limit,
+                ),
+            )
 
-        related = []
-        for row in cursor.fetchall():
-            related.append({"filename": row[0], "name": row[1], "description": row[2]})
+            related = []
+            for row in cursor.fetchall():
+                related.append(
+                    {"filename": row[0], "name": row[1], "description": row[2]}
+                )
 
-        conn.close()
         return related
 
     def run(self, host: str = "127.0.0.1", port: int = 8000, debug: bool = False):
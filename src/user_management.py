@@ -9,12 +9,17 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.responses import HTMLResponse
 from pydantic import BaseModel, EmailStr
 from typing import List, Optional
-import sqlite3
 import hashlib
 import secrets
 import jwt
 from datetime import datetime, timedelta
 import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from db_connections import ConnectionManager  # noqa: E402
+
 
 # Configuration - Use environment variables for security
 SECRET_KEY = os.environ.get("JWT_SECRET_KEY", secrets.token_urlsafe(32))
@@ -62,95 +67,101 @@ class Token(BaseModel):
 
 
 class UserManager:
-    def __init__(self, db_path: str = "users.db"):
-        self.db_path = db_path
+    def __init__(
+        self,
+        db_path: str = "users.db",
+        connections: Optional[ConnectionManager] = None,
+    ):
+        self.connections = connections or ConnectionManager(db_path)
+        self.db_path = self.connections.db_path
         self.init_database()
 
     def init_database(self):
         """Initialize user database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                email TEXT UNIQUE NOT NULL,
-                full_name TEXT NOT NULL,
-                password_hash TEXT NOT NULL,
-                role TEXT DEFAULT 'user',
-                active BOOLEAN DEFAULT 1,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                last_login TIMESTAMP
-            )
-        """)
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS user_sessions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER,
-                token_hash TEXT UNIQUE NOT NULL,
-                expires_at TIMESTAMP NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id)
-            )
-        """)
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS user_permissions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER,
-                resource TEXT NOT NULL,
-                action TEXT NOT NULL,
-                granted BOOLEAN DEFAULT 1,
-                FOREIGN KEY (user_id) REFERENCES users (id)
-            )
-        """)
+        with self.connections.writer() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS users (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    username TEXT UNIQUE NOT NULL,
+                    email TEXT UNIQUE NOT NULL,
+                    full_name TEXT NOT NULL,
+                    password_hash TEXT NOT NULL,
+                    role TEXT DEFAULT 'user',
+                    active BOOLEAN DEFAULT 1,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    last_login TIMESTAMP
+                )
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS user_sessions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER,
+                    token_hash TEXT UNIQUE NOT NULL,
+                    expires_at TIMESTAMP NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (user_id) REFERENCES users (id)
+                )
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS user_permissions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER,
+                    resource TEXT NOT NULL,
+                    action TEXT NOT NULL,
+                    granted BOOLEAN DEFAULT 1,
+                    FOREIGN KEY (user_id) REFERENCES users (id)
+                )
+            """)
 
-        conn.commit()
-        conn.close()
+            conn.commit()
 
         # Create default admin user if none exists
         self.create_default_admin()
 
     def create_default_admin(self):
         """Create default admin user if none exists."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT COUNT(*) FROM users WHERE role = 'admin'")
-        admin_count = cursor.fetchone()[0]
+        with self.connections.writer() as conn:
+            cursor = conn.cursor()
 
-        if admin_count == 0:
-            # Use environment variable or generate secure random password
-            admin_password = os.environ.get("ADMIN_PASSWORD", secrets.token_urlsafe(16))
-            password_hash = self.hash_password(admin_password)
-
-            cursor.execute(
-                """
-                INSERT INTO users (username, email, full_name, password_hash, role)
-                VALUES (?, ?, ?, ?, ?)
-            """,
-                (
-                    "admin",
-                    "admin@n8n-workflows.com",
-                    "System Administrator",
-                    password_hash,
-                    "admin",
-                ),
-            )
+            cursor.execute("SELECT COUNT(*) FROM users WHERE role = 'admin'")
+            admin_count = cursor.fetchone()[0]
 
-            conn.commit()
-            # Only print password if it was auto-generated (not from env)
-            if "ADMIN_PASSWORD" not in os.environ:
-                print(f"Default admin user created: admin/{admin_password}")
-                print(
-                    "WARNING: Please change this password immediately after first login!"
+            if admin_count == 0:
+                # Use environment variable or generate secure random password
+                admin_password = os.environ.get(
+                    "ADMIN_PASSWORD", secrets.token_urlsafe(16)
+                )
+                password_hash = self.hash_password(admin_password)
+
+                cursor.execute(
+                    """
+                    INSERT INTO users (username, email, full_name, password_hash, role)
+                    VALUES (?, ?, ?, ?, ?)
+                """,
+                    (
+                        "admin",
+                        "admin@n8n-workflows.com",
+                        "System Administrator",
+                        password_hash,
+                        "admin",
+                    ),
                 )
-            else:
-                print("Default admin user created with environment-configured password")
 
-        conn.close()
+                conn.commit()
+                # Only print password if it was auto-generated (not from env)
+                if "ADMIN_PASSWORD" not in os.environ:
+                    print(f"Default admin user created: admin/{admin_password}")
+                    print(
+                        "WARNING: Please change this password immediately after first login!"
+                    )
+                else:
+                    print(
+                        "Default admin user created with environment-configured password"
+                    )
 
     def hash_password(self, password: str) -> str:
         """Hash password using SHA-256."""
@@ -162,10 +173,9 @@ class UserManager:
 
     def create_user(self, user_data: UserCreate) -> User:
         """Create a new user."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self.connections.writer() as conn:
+            cursor = conn.cursor()
 
-        try:
             # Check if username or email already exists
             cursor.execute(
                 "SELECT COUNT(*) FROM users WHERE username = ? OR email = ?",
@@ -203,27 +213,20 @@ class UserManager:
                 created_at=datetime.now().isoformat(),
             )
 
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            conn.close()
-
     def authenticate_user(self, username: str, password: str) -> Optional[User]:
         """Authenticate user and return user data."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-            SELECT id, username, email, full_name, password_hash, role, active
-            FROM users WHERE username = ? AND active = 1
-        """,
-            (username,),
-        )
+        with self.connections.reader() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute(
+                """
+                SELECT id, username, email, full_name, password_hash, role, active
+                FROM users WHERE username = ? AND active = 1
+            """,
+                (username,),
+            )
 
-        row = cursor.fetchone()
-        conn.close()
+            row = cursor.fetchone()
 
         if row and self.verify_password(password, row[4]):
             return User(
@@ -265,19 +268,18 @@ class UserManager:
 
     def get_user_by_id(self, user_id: int) -> Optional[User]:
         """Get user by ID."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-            SELECT id, username, email, full_name, role, active, created_at
-            FROM users WHERE id = ?
-        """,
-            (user_id,),
-        )
+        with self.connections.reader() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute(
+                """
+                SELECT id, username, email, full_name, role, active, created_at
+                FROM users WHERE id = ?
+            """,
+                (user_id,),
+            )
 
-        row = cursor.fetchone()
-        conn.close()
+            row = cursor.fetchone()
 
         if row:
             return User(
@@ -294,37 +296,35 @@ class UserManager:
 
     def get_all_users(self) -> List[User]:
         """Get all users."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT id, username, email, full_name, role, active, created_at
-            FROM users ORDER BY created_at DESC
-        """)
-
-        users = []
-        for row in cursor.fetchall():
-            users.append(
-                User(
-                    id=row[0],
-                    username=row[1],
-                    email=row[2],
-                    full_name=row[3],
-                    role=row[4],
-                    active=bool(row[5]),
-                    created_at=row[6],
+        with self.connections.reader() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                SELECT id, username, email, full_name, role, active, created_at
+                FROM users ORDER BY created_at DESC
+            """)
+
+            users = []
+            for row in cursor.fetchall():
+                users.append(
+                    User(
+                        id=row[0],
+                        username=row[1],
+                        email=row[2],
+                        full_name=row[3],
+                        role=row[4],
+                        active=bool(row[5]),
+                        created_at=row[6],
+                    )
                 )
-            )
 
-        conn.close()
         return users
 
     def update_user(self, user_id: int, update_data: UserUpdate) -> Optional[User]:
         """Update user data."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self.connections.writer() as conn:
+            cursor = conn.cursor()
 
-        try:
             # Build update query dynamically
             updates = []
             params = []
@@ -356,26 +356,14 @@ class UserManager:
 
             return self.get_user_by_id(user_id)
 
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            conn.close()
-
     def delete_user(self, user_id: int) -> bool:
         """Delete user (soft delete by setting active=False)."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self.connections.writer() as conn:
+            cursor = conn.cursor()
 
-        try:
             cursor.execute("UPDATE users SET active = 0 WHERE id = ?", (user_id,))
             conn.commit()
             return cursor.rowcount > 0
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            conn.close()
 
 
 # Initialize user manager
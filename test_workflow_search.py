@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test Workflow Search
+Index a few workflows with CJK and camelCase names and check they can be found
+"""
+
+import json
+
+from workflow_db import WorkflowDatabase
+
+SAMPLE_WORKFLOWS = {
+    "0001_Email_Notify_Triggered.json": "发送邮件通知",
+    "0002_Translate_Docs_Webhook.json": "翻译文档并保存",
+    "0003_GoogleSheets_Typeform_Automate.json": "Typeform responses to Sheets",
+}
+
+
+def build_database(tmp_path) -> WorkflowDatabase:
+    """Index SAMPLE_WORKFLOWS into a fresh database under ``tmp_path``."""
+    workflows_dir = tmp_path / "workflows"
+    workflows_dir.mkdir()
+    for filename, name in SAMPLE_WORKFLOWS.items():
+        workflow = {
+            "name": name,
+            "nodes": [{"name": "Start", "type": "n8n-nodes-base.manualTrigger"}],
+            "connections": {},
+        }
+        (workflows_dir / filename).write_text(
+            json.dumps(workflow, ensure_ascii=False), encoding="utf-8"
+        )
+
+    db = WorkflowDatabase(str(tmp_path / "workflows.db"))
+    db.workflows_dir = str(workflows_dir)
+    db.index_all_workflows()
+    return db
+
+
+def search_filenames(db: WorkflowDatabase, query: str) -> list:
+    results, _ = db.search_workflows(query=query)
+    return sorted(workflow["filename"] for workflow in results)
+
+
+def test_cjk_search(tmp_path):
+    """Two-character CJK words match inside longer names"""
+    db = build_database(tmp_path)
+    try:
+        assert search_filenames(db, "邮件") == ["0001_Email_Notify_Triggered.json"]
+        assert search_filenames(db, "翻译") == ["0002_Translate_Docs_Webhook.json"]
+        assert search_filenames(db, "文档") == ["0002_Translate_Docs_Webhook.json"]
+        assert search_filenames(db, "邮件通知") == ["0001_Email_Notify_Triggered.json"]
+        assert search_filenames(db, "翻译 保存") == ["0002_Translate_Docs_Webhook.json"]
+        assert search_filenames(db, "日报") == []
+    finally:
+        db.close()
+
+
+def test_substring_search(tmp_path):
+    """Substrings of camelCase filenames fall back to the trigram index"""
+    db = build_database(tmp_path)
+    try:
+        assert search_filenames(db, "oogleshee") == [
+            "0003_GoogleSheets_Typeform_Automate.json"
+        ]
+        assert search_filenames(db, "Typeform") == [
+            "0003_GoogleSheets_Typeform_Automate.json"
+        ]
+    finally:
+        db.close()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Test Workflow Watch Mode
+Check that a new workflow file is reindexed once and the watcher then settles
+"""
+
+import json
+import os
+import time
+
+from workflow_db import WorkflowDatabase
+from workflow_watch import WorkflowWatcher
+
+
+def test_new_file_reindexed_once(tmp_path):
+    """Reading a file while indexing it must not queue it again"""
+    workflows_dir = tmp_path / "workflows"
+    (workflows_dir / "Manual").mkdir(parents=True)
+    db = WorkflowDatabase(str(tmp_path / "workflows.db"))
+    db.workflows_dir = str(workflows_dir)
+
+    batches = []
+    index_workflow_files = db.index_workflow_files
+
+    def record(paths):
+        batches.append(list(paths))
+        return index_workflow_files(paths)
+
+    db.index_workflow_files = record
+
+    watcher = WorkflowWatcher(db, debounce=0.1, poll_interval=0.1)
+    watcher.start()
+    try:
+        time.sleep(0.5)
+        workflow = {"name": "Watched", "nodes": [], "connections": {}}
+        (workflows_dir / "Manual" / "0001_Watched.json").write_text(
+            json.dumps(workflow)
+        )
+        # Long enough for several debounce windows to pass
+        time.sleep(1.5)
+    finally:
+        watcher.stop()
+        db.close()
+
+    assert len(batches) == 1
+    assert [os.path.basename(path) for path in batches[0]] == ["0001_Watched.json"]
@@ -6,23 +6,512 @@ SQLite-based workflow indexer and search engine for instant performance.
 
 import sqlite3
 import json
+import base64
 import os
 import datetime
 import hashlib
+import functools
+import subprocess
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 
+from db_connections import ConnectionManager
+from query_cache import MISSING, QueryCache
+from workflow_diagram import DIAGRAM_VERSION, generate_mermaid_diagram
+from workflow_taxonomy import get_taxonomy
+
+
+def _select_json_backend(preferred: Optional[str] = None):
+    """Pick the fastest available JSON parser for workflow files.
+
+    Tries orjson, then simdjson, then falls back to the standard library.
+    ``preferred`` (or the WORKFLOW_JSON_BACKEND environment variable) forces
+    a specific backend; an unavailable choice falls back to ``json``.
+    """
+    preferred = preferred or os.environ.get("WORKFLOW_JSON_BACKEND", "")
+    candidates = [preferred] if preferred else ["orjson", "simdjson"]
+
+    for name in candidates:
+        if name == "orjson":
+            try:
+                import orjson
+
+                return "orjson", orjson.loads
+            except ImportError:
+                continue
+        if name == "simdjson":
+            try:
+                import simdjson
+
+                return "simdjson", simdjson.loads
+            except ImportError:
+                continue
+
+    return "json", json.loads
+
+
+JSON_BACKEND, _fast_json_loads = _select_json_backend()
+
+
+def _select_hash_backend():
+    """Pick the content hash used for change detection and the analysis cache.
+
+    xxHash (XXH3-128) when installed, otherwise BLAKE2b with a 128-bit
+    digest; both are faster than MD5 and produce 32 hex characters.
+    """
+    try:
+        import xxhash
+
+        return "xxh3_128", xxhash.xxh3_128
+    except ImportError:
+        return "blake2b", functools.partial(hashlib.blake2b, digest_size=16)
+
+
+HASH_BACKEND, _new_hash = _select_hash_backend()
+
+# index_meta key marking a database produced by --build-snapshot
+SNAPSHOT_META_KEY = "snapshot_built_at"
+
+# How search totals are computed: "exact" counts every match (cached per
+# index generation), "estimate" only looks one row past the page, "none"
+# skips counting
+TOTAL_MODES = ("exact", "estimate", "none")
+# Distinct (query, filters) exact totals kept in memory
+TOTAL_CACHE_SIZE = 512
+
+# Fields search_facets can count results by
+FACET_FIELDS = ("trigger_type", "complexity", "category", "integration")
+
+# Columns of workflows_fts, the word index behind ranked search
+FTS_COLUMNS = ("filename", "name", "description", "integrations", "tags")
+# Columns of workflows_trigram, the substring index used when word search
+# cannot match: inside camelCase/underscored names, and in CJK text
+TRIGRAM_COLUMNS = ("filename", "name", "description", "integrations")
+# The trigram tokenizer cannot match terms shorter than this
+TRIGRAM_MIN_LENGTH = 3
+# Triggers mirroring workflows rows into the FTS tables
+FTS_TRIGGERS = (
+    "workflows_ai",
+    "workflows_ad",
+    "workflows_au",
+    "workflows_trigram_ai",
+    "workflows_trigram_ad",
+    "workflows_trigram_au",
+)
+
+# Tables written by indexing, copied back by shadow_reindex; everything
+# else in the file (community ratings, users, ...) belongs to other services
+INDEX_TABLES = (
+    "workflows",
+    "workflow_integrations",
+    "workflow_nodes",
+    "workflow_edges",
+    "index_meta",
+)
+# Content-addressed caches, merged rather than replaced by shadow_reindex
+INDEX_CACHE_TABLES = ("analysis_cache", "workflow_diagrams")
+
+# Curated filename -> browse category assignments, read at index time
+CATEGORIES_FILE = Path(__file__).parent / "context" / "search_categories.json"
+# Category of workflows without an assignment
+UNCATEGORIZED = "Uncategorized"
+
+
+def _readonly_uri(db_path: str) -> str:
+    """SQLite URI opening ``db_path`` read-only."""
+    return Path(db_path).resolve().as_uri() + "?mode=ro"
+
+
+def _read_generation(conn: sqlite3.Connection) -> int:
+    """Index generation recorded in index_meta, 0 before the first index."""
+    row = conn.execute(
+        "SELECT value FROM index_meta WHERE key = 'generation'"
+    ).fetchone()
+    return int(row[0]) if row else 0
+
+
+def load_category_assignments(path: Path = CATEGORIES_FILE) -> Dict[str, str]:
+    """Filename -> category from search_categories.json; empty ones are skipped."""
+    try:
+        with open(path, "rb") as f:
+            entries = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Could not load category assignments from {path}: {e}")
+        return {}
+    return {
+        entry["filename"]: entry["category"]
+        for entry in entries
+        if entry.get("filename") and entry.get("category")
+    }
+
+
+def is_latin(text: str) -> bool:
+    """True when every letter of ``text`` is in the Latin Unicode blocks."""
+    return all(ord(ch) < 0x250 or not ch.isalpha() for ch in text)
+
+
+def trigram_match(query: str) -> Optional[str]:
+    """workflows_trigram MATCH expression requiring each term as a substring.
+
+    None when a term is too short for trigrams; such queries need the word
+    index instead.
+    """
+    terms = query.replace("*", " ").split()
+    if not terms or any(len(term) < TRIGRAM_MIN_LENGTH for term in terms):
+        return None
+    return " AND ".join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+
+def _like_pattern(text: str) -> str:
+    """LIKE pattern matching ``text`` anywhere, with its wildcards escaped."""
+    for special in ("\\", "%", "_"):
+        text = text.replace(special, "\\" + special)
+    return f"%{text}%"
+
+
+# Workflows with a LIKE pattern in any trigram-indexed column, for terms too
+# short to MATCH. Trigrams cannot narrow such patterns, and scanning
+# workflows directly measured faster than scanning workflows_trigram
+TRIGRAM_LIKE = (
+    "("
+    + " OR ".join(f"w.{column} LIKE ? ESCAPE '\\'" for column in TRIGRAM_COLUMNS)
+    + ")"
+)
+
+
+def encode_cursor(workflow: Dict[str, Any]) -> str:
+    """Opaque keyset cursor resuming a search after ``workflow``.
+
+    Carries both sort keys, so the same token works for ranked (FTS) and
+    unranked listings.
+    """
+    key = [
+        workflow["rank"],
+        workflow["id"],
+        workflow["analyzed_at"],
+        workflow["filename"],
+    ]
+    token = base64.urlsafe_b64encode(json.dumps(key).encode())
+    return token.decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[float, int, str, str]:
+    """Sort keys from an encode_cursor token; ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        rank, workflow_id, analyzed_at, filename = json.loads(raw)
+        return float(rank), int(workflow_id), str(analyzed_at), str(filename)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {token!r}") from e
+
+
+def _remove_db_files(db_path: str) -> None:
+    """Delete a database file together with its WAL and shared-memory files."""
+    for path in (db_path, f"{db_path}-wal", f"{db_path}-shm"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def shard_of(filename: str, shard_count: int) -> int:
+    """Deterministic shard (0-based) of a workflow file for ``--shard i/N``.
+
+    Keyed by filename rather than full path so files sharing a filename,
+    which share one row in the index, always land in the same shard.
+    """
+    digest = hashlib.blake2b(filename.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shard_count
+
+
+def shard_db_path(db_path: str, shard_index: int, shard_count: int) -> str:
+    """Path of the shard database derived from the main database path."""
+    root, ext = os.path.splitext(db_path)
+    return f"{root}.shard-{shard_index}-of-{shard_count}{ext}"
+
+
+def is_snapshot(db_path: str) -> bool:
+    """Return True if ``db_path`` is a prebuilt read-only index snapshot."""
+    if not os.path.isfile(db_path):
+        return False
+    try:
+        conn = sqlite3.connect(_readonly_uri(db_path), uri=True)
+        try:
+            row = conn.execute(
+                "SELECT value FROM index_meta WHERE key = ?", (SNAPSHOT_META_KEY,)
+            ).fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return False
+    return row is not None
+
+
+# Bump when analyze_nodes/_analyze_document output changes so cached
+# analyses from older code are recomputed
+ANALYSIS_VERSION = "2"
+
+
+def parse_workflow_json(content: bytes) -> Any:
+    """Parse raw workflow bytes with the selected JSON backend.
+
+    Documents the fast parsers reject (NaN literals, oversized integers)
+    are retried with the standard library so they are still indexed.
+    """
+    try:
+        return _fast_json_loads(content)
+    except ValueError:
+        if _fast_json_loads is json.loads:
+            raise
+        return json.loads(content)
+
+
+try:
+    import ijson
+except ImportError:  # Streaming is optional; oversized files are parsed in memory
+    ijson = None
+
+# Top-level workflow fields kept when a document is streamed
+STREAMED_SCALAR_FIELDS = (
+    "id",
+    "name",
+    "active",
+    "description",
+    "createdAt",
+    "updatedAt",
+)
+STREAMED_CONTAINER_FIELDS = ("tags", "connections")
+# Node fields kept from each workflow node; parameters etc. are dropped
+NODE_FIELDS = ("id", "name", "type")
+
+
+class _HashingReader:
+    """File wrapper that hashes and counts bytes as a streaming parser reads them."""
+
+    def __init__(self, f):
+        self._f = f
+        self.hasher = _new_hash()
+        self.size = 0
+
+    def read(self, n: int = -1) -> bytes:
+        chunk = self._f.read(n)
+        self.hasher.update(chunk)
+        self.size += len(chunk)
+        return chunk
+
+
+def stream_workflow_document(file_path: str) -> Tuple[Dict[str, Any], str, int]:
+    """Extract indexable fields from a workflow file without building its full tree.
+
+    Only top-level metadata, ``tags``, ``connections`` and each node's
+    NODE_FIELDS are materialized; node parameters and pinned data are
+    skipped as parse events. Returns ``(document, content_hash, size)``, reading
+    the file once. Requires ijson; raises ValueError on invalid JSON.
+    """
+    doc: Dict[str, Any] = {}
+    nodes: List[Dict[str, Any]] = []
+    depth = 0
+    top_key = node_key = None
+    node: Optional[Dict[str, Any]] = None
+    builder = None
+
+    with open(file_path, "rb") as f:
+        reader = _HashingReader(f)
+        try:
+            for event, value in ijson.basic_parse(reader, use_float=True):
+                if builder is not None:
+                    # Inside tags/connections: small, so build them as objects
+                    builder.event(event, value)
+                    if event in ("start_map", "start_array"):
+                        depth += 1
+                    elif event in ("end_map", "end_array"):
+                        depth -= 1
+                        if depth == 1:
+                            doc[top_key] = builder.value
+                            builder = None
+                    continue
+
+                if event in ("start_map", "start_array"):
+                    if depth == 0 and event != "start_map":
+                        raise ValueError("workflow document is not a JSON object")
+                    if depth == 1 and top_key in STREAMED_CONTAINER_FIELDS:
+                        builder = ijson.ObjectBuilder()
+                        builder.event(event, value)
+                    elif depth == 1 and top_key == "nodes":
+                        doc["nodes"] = nodes
+                    elif depth == 2 and top_key == "nodes" and event == "start_map":
+                        node = {}
+                        nodes.append(node)
+                    depth += 1
+                elif event in ("end_map", "end_array"):
+                    depth -= 1
+                elif event == "map_key":
+                    if depth == 1:
+                        top_key = value
+                    elif depth == 3:
+                        node_key = value
+                elif depth == 0:
+                    raise ValueError("workflow document is not a JSON object")
+                elif depth == 1:
+                    if top_key in STREAMED_SCALAR_FIELDS:
+                        doc[top_key] = value
+                elif depth == 3 and top_key == "nodes" and node is not None:
+                    if node_key in NODE_FIELDS:
+                        node[node_key] = value
+        except ijson.JSONError as e:
+            raise ValueError(str(e)) from e
+
+    return doc, reader.hasher.hexdigest(), reader.size
+
+
+def extract_connection_edges(
+    connections: Any,
+) -> List[Tuple[str, str, int, str, int]]:
+    """Flatten n8n ``connections`` into edge tuples.
+
+    Each edge is ``(source, target, output_index, connection_type,
+    output_count)``, where ``output_count`` is how many outputs of that
+    connection type the source node has (including unconnected ones).
+    """
+    edges = []
+    if not isinstance(connections, dict):
+        return edges
+    for source_name, outputs_by_type in connections.items():
+        if not isinstance(outputs_by_type, dict):
+            continue
+        for connection_type, outputs in outputs_by_type.items():
+            if not isinstance(outputs, list):
+                continue
+            for output_index, targets in enumerate(outputs):
+                if not isinstance(targets, list):
+                    continue
+                for target in targets:
+                    if isinstance(target, dict) and "node" in target:
+                        edges.append(
+                            (
+                                source_name,
+                                target["node"],
+                                output_index,
+                                connection_type,
+                                len(outputs),
+                            )
+                        )
+    return edges
+
+
+# Upsert keyed on filename; unlike INSERT OR REPLACE this keeps the row id
+# stable and fires the update trigger, so no stale rows are left in FTS.
+UPSERT_SQL = """
+    INSERT INTO workflows (
+        filename, name, workflow_id, active, description, trigger_type,
+        complexity, node_count, integrations, tags, created_at, updated_at,
+        file_path, file_hash, file_size, file_mtime, file_inode, category,
+        analyzed_at
+    ) VALUES (
+        ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP
+    )
+    ON CONFLICT(filename) DO UPDATE SET
+        name = excluded.name,
+        workflow_id = excluded.workflow_id,
+        active = excluded.active,
+        description = excluded.description,
+        trigger_type = excluded.trigger_type,
+        complexity = excluded.complexity,
+        node_count = excluded.node_count,
+        integrations = excluded.integrations,
+        tags = excluded.tags,
+        created_at = excluded.created_at,
+        updated_at = excluded.updated_at,
+        file_path = excluded.file_path,
+        file_hash = excluded.file_hash,
+        file_size = excluded.file_size,
+        file_mtime = excluded.file_mtime,
+        file_inode = excluded.file_inode,
+        category = excluded.category,
+        analyzed_at = excluded.analyzed_at
+"""
+
 
 class WorkflowDatabase:
     """High-performance SQLite database for workflow metadata and search."""
 
-    def __init__(self, db_path: str = None):
+    # Rows per executemany when writing analyzed workflows
+    write_batch_size = 500
+
+    # Files larger than this are streamed (with ijson) instead of being
+    # parsed into a full object tree, keeping indexing memory flat
+    max_parse_bytes = int(os.environ.get("WORKFLOW_MAX_PARSE_BYTES", 256 * 1024))
+
+    # Reuse stored analyses for content hashes seen before
+    use_analysis_cache = True
+
+    # bm25 weight of each workflows_fts column, stored as the table's default
+    # rank by init_database, so a hit in the workflow name outranks one in
+    # its filename or description
+    fts_column_weights = {
+        "filename": 1.0,
+        "name": 10.0,
+        "description": 2.0,
+        "integrations": 5.0,
+        "tags": 3.0,
+    }
+
+    # Prefix lengths indexed by workflows_fts, making "slac*" an index lookup
+    fts_prefix = "2 3 4"
+
+    # Pages of search results kept in memory, and for how many seconds;
+    # entries are keyed by index generation, so reindexing invalidates them
+    result_cache_size = 256
+    result_cache_ttl = 300.0
+
+    def __init__(
+        self, db_path: str = None, connections: Optional[ConnectionManager] = None
+    ):
         # Use environment variable if no path provided
+        if db_path is None:
+            db_path = connections.db_path if connections else None
         if db_path is None:
             db_path = os.environ.get("WORKFLOW_DB_PATH", "workflows.db")
         self.db_path = db_path
         self.workflows_dir = "workflows"
-        self.init_database()
+        # Loaded from CATEGORIES_FILE on first use and on each full index
+        self._category_assignments: Optional[Dict[str, str]] = None
+        # Prebuilt snapshots are opened immutable and never indexed into
+        self.read_only = is_snapshot(db_path)
+        if not self.read_only:
+            self.init_database()
+        # Share a manager between services using the same file, or own one
+        self._owns_connections = connections is None
+        self.connections = connections or ConnectionManager(
+            db_path, read_only=self.read_only
+        )
+        self._reindex_lock = threading.Lock()
+        self._init_caches()
+
+    def _init_caches(self):
+        self.result_cache = QueryCache(self.result_cache_size, self.result_cache_ttl)
+        self._total_cache = QueryCache(TOTAL_CACHE_SIZE)
+        self._cache_generation: Optional[int] = None
+
+    def __getstate__(self):
+        # Worker processes get a copy without this process's connections,
+        # caches and locks
+        state = self.__dict__.copy()
+        for name in ("connections", "result_cache", "_total_cache", "_reindex_lock"):
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._owns_connections = True
+        self.connections = ConnectionManager(self.db_path, read_only=self.read_only)
+        self._reindex_lock = threading.Lock()
+        self._init_caches()
+
+    def close(self):
+        """Close pooled connections, unless the manager was passed in."""
+        if self._owns_connections:
+            self.connections.close()
 
     def init_database(self):
         """Initialize SQLite database with optimized schema and indexes."""
@@ -48,14 +537,149 @@ class WorkflowDatabase:
                 tags TEXT,         -- JSON array
                 created_at TEXT,
                 updated_at TEXT,
+                file_path TEXT,    -- relative to the workflows directory
                 file_hash TEXT,
                 file_size INTEGER,
+                file_mtime INTEGER,  -- st_mtime_ns at last index
+                file_inode INTEGER,
+                category TEXT,     -- browse category, see CATEGORIES_FILE
                 analyzed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
 
-        # Create FTS5 table for full-text search
+        # Add change-detection and category columns to databases created
+        # before they existed
+        existing_columns = {
+            row[1] for row in conn.execute("PRAGMA table_info(workflows)")
+        }
+        for column, column_type in (
+            ("file_path", "TEXT"),
+            ("file_mtime", "INTEGER"),
+            ("file_inode", "INTEGER"),
+            ("category", "TEXT"),
+        ):
+            if column not in existing_columns:
+                conn.execute(
+                    f"ALTER TABLE workflows ADD COLUMN {column} {column_type}"
+                )
+
+        # Key/value store for index-wide state such as the last indexed commit
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS index_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        """)
+
+        # Derived analysis keyed by content hash, reused for unchanged or
+        # duplicated content across forced reindexes and renames
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS analysis_cache (
+                content_hash TEXT PRIMARY KEY,
+                version TEXT NOT NULL,
+                analysis TEXT NOT NULL  -- JSON
+            )
+        """)
+
+        # Rendered Mermaid diagrams keyed by content hash, filled lazily on
+        # first request (and for every workflow when building a snapshot)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS workflow_diagrams (
+                file_hash TEXT PRIMARY KEY,
+                version TEXT NOT NULL,
+                mermaid TEXT NOT NULL
+            )
+        """)
+
+        # One row per (workflow, integration) for index-backed category and
+        # integration queries instead of LIKE scans over the JSON column
+        backfill_integrations = not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' "
+            "AND name = 'workflow_integrations'"
+        ).fetchone()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS workflow_integrations (
+                workflow_id INTEGER NOT NULL,
+                integration TEXT NOT NULL,
+                category TEXT    -- service category, e.g. messaging
+            )
+        """)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_wi_workflow "
+            "ON workflow_integrations(workflow_id)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_wi_integration "
+            "ON workflow_integrations(integration, workflow_id)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_wi_category "
+            "ON workflow_integrations(category, workflow_id)"
+        )
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS workflows_integrations_ad AFTER DELETE ON workflows BEGIN
+                DELETE FROM workflow_integrations WHERE workflow_id = old.id;
+            END
+        """)
+        if backfill_integrations:
+            self._backfill_integrations(conn)
+
+        # Node and connection graph of each workflow, so graph queries and
+        # diagrams are served from the index instead of re-parsing files
+        reanalyze_graph = not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' "
+            "AND name = 'workflow_edges'"
+        ).fetchone()
         conn.execute("""
+            CREATE TABLE IF NOT EXISTS workflow_nodes (
+                workflow_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,  -- index in the workflow's nodes list
+                node_id TEXT,
+                name TEXT,
+                type TEXT,
+                PRIMARY KEY (workflow_id, position)
+            ) WITHOUT ROWID
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS workflow_edges (
+                workflow_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,  -- order within the workflow's connections
+                source_node TEXT NOT NULL,
+                source_type TEXT,
+                target_node TEXT NOT NULL,
+                target_type TEXT,
+                output_index INTEGER NOT NULL,
+                output_count INTEGER NOT NULL,  -- outputs of this type on the source
+                connection_type TEXT NOT NULL,  -- main, ai_tool, ...
+                PRIMARY KEY (workflow_id, position)
+            ) WITHOUT ROWID
+        """)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_wn_type ON workflow_nodes(type, workflow_id)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_we_types "
+            "ON workflow_edges(source_type, target_type, workflow_id)"
+        )
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS workflows_graph_ad AFTER DELETE ON workflows BEGIN
+                DELETE FROM workflow_nodes WHERE workflow_id = old.id;
+                DELETE FROM workflow_edges WHERE workflow_id = old.id;
+            END
+        """)
+        if reanalyze_graph:
+            # Connections were never stored, so existing rows must be re-read
+            conn.execute("UPDATE workflows SET file_hash = NULL, file_mtime = NULL")
+
+        # Create FTS5 table for full-text search; tables from before prefix
+        # indexes existed are dropped and rebuilt from workflows
+        fts_sql = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'workflows_fts'"
+        ).fetchone()
+        rebuild_fts = fts_sql is not None and "prefix" not in fts_sql[0]
+        if rebuild_fts:
+            conn.execute("DROP TABLE workflows_fts")
+        conn.execute(f"""
             CREATE VIRTUAL TABLE IF NOT EXISTS workflows_fts USING fts5(
                 filename,
                 name,
@@ -63,9 +687,31 @@ class WorkflowDatabase:
                 integrations,
                 tags,
                 content=workflows,
-                content_rowid=id
+                content_rowid=id,
+                prefix='{self.fts_prefix}'
             )
         """)
+        if rebuild_fts:
+            conn.execute("INSERT INTO workflows_fts(workflows_fts) VALUES('rebuild')")
+
+        # Trigram index for substring and CJK search (see TRIGRAM_COLUMNS);
+        # filled from workflows when added to an existing database
+        add_trigram = not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'workflows_trigram'"
+        ).fetchone()
+        conn.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS workflows_trigram USING fts5(
+                {", ".join(TRIGRAM_COLUMNS)},
+                content=workflows,
+                content_rowid=id,
+                tokenize='trigram'
+            )
+        """)
+        if add_trigram:
+            conn.execute(
+                "INSERT INTO workflows_trigram(workflows_trigram) VALUES('rebuild')"
+            )
+        self._set_fts_rank(conn)
 
         # Create indexes for fast filtering
         conn.execute(
@@ -79,8 +725,48 @@ class WorkflowDatabase:
             "CREATE INDEX IF NOT EXISTS idx_node_count ON workflows(node_count)"
         )
         conn.execute("CREATE INDEX IF NOT EXISTS idx_filename ON workflows(filename)")
+        # Unranked listings page by (analyzed_at, filename) keysets; a rowid
+        # tiebreak could not be used to seek into the index
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_analyzed_at "
+            "ON workflows(analyzed_at, filename)"
+        )
+        # Category listings filter and page on the same index
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_category "
+            "ON workflows(category, analyzed_at, filename)"
+        )
 
         # Create triggers to keep FTS table in sync
+        self._create_fts_triggers(conn)
+
+        if "category" not in existing_columns and self._refresh_categories(conn):
+            self._bump_generation(conn)
+
+        conn.commit()
+        conn.close()
+
+    def _set_fts_rank(self, conn: sqlite3.Connection) -> None:
+        """Make weighted bm25 (see fts_column_weights) the rank of both FTS tables."""
+        for table, columns in (
+            ("workflows_fts", FTS_COLUMNS),
+            ("workflows_trigram", TRIGRAM_COLUMNS),
+        ):
+            weights = ", ".join(
+                str(float(self.fts_column_weights.get(column, 1.0)))
+                for column in columns
+            )
+            rank = f"bm25({weights})"
+            current = conn.execute(
+                f"SELECT v FROM {table}_config WHERE k = 'rank'"
+            ).fetchone()
+            if not current or current[0] != rank:
+                conn.execute(
+                    f"INSERT INTO {table}({table}, rank) VALUES('rank', ?)", (rank,)
+                )
+
+    def _create_fts_triggers(self, conn: sqlite3.Connection) -> None:
+        """Create the triggers that mirror workflows rows into the FTS tables."""
         conn.execute("""
             CREATE TRIGGER IF NOT EXISTS workflows_ai AFTER INSERT ON workflows BEGIN
                 INSERT INTO workflows_fts(rowid, filename, name, description, integrations, tags)
@@ -104,16 +790,84 @@ class WorkflowDatabase:
             END
         """)
 
-        conn.commit()
-        conn.close()
+        # Only updates touching indexed columns re-tokenize trigram rows
+        columns = ", ".join(TRIGRAM_COLUMNS)
+        old_values = ", ".join(f"old.{column}" for column in TRIGRAM_COLUMNS)
+        new_values = ", ".join(f"new.{column}" for column in TRIGRAM_COLUMNS)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS workflows_trigram_ai
+            AFTER INSERT ON workflows BEGIN
+                INSERT INTO workflows_trigram(rowid, {columns})
+                VALUES (new.id, {new_values});
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS workflows_trigram_ad
+            AFTER DELETE ON workflows BEGIN
+                INSERT INTO workflows_trigram(workflows_trigram, rowid, {columns})
+                VALUES ('delete', old.id, {old_values});
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS workflows_trigram_au
+            AFTER UPDATE OF {columns} ON workflows BEGIN
+                INSERT INTO workflows_trigram(workflows_trigram, rowid, {columns})
+                VALUES ('delete', old.id, {old_values});
+                INSERT INTO workflows_trigram(rowid, {columns})
+                VALUES (new.id, {new_values});
+            END
+        """)
 
     def get_file_hash(self, file_path: str) -> str:
-        """Get MD5 hash of file for change detection."""
-        hash_md5 = hashlib.md5()
+        """Get content hash of file for change detection."""
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+            return self.get_content_hash(f.read())
+
+    def get_content_hash(self, content: bytes) -> str:
+        """Get content hash (see HASH_BACKEND) of already-read file content."""
+        return _new_hash(content).hexdigest()
+
+    def _git(self, *args: str) -> Optional[str]:
+        """Run a git command inside the workflows directory, or None on failure."""
+        try:
+            result = subprocess.run(
+                ["git", "-c", "core.quotePath=false", "-C", self.workflows_dir]
+                + list(args),
+                capture_output=True,
+                text=True,
+                timeout=30,
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None
+        if result.returncode != 0:
+            return None
+        return result.stdout
+
+    def get_git_head(self) -> Optional[str]:
+        """Get the commit checked out in the workflows directory, if any."""
+        output = self._git("rev-parse", "HEAD")
+        return output.strip() if output else None
+
+    def get_git_changed_files(self, since_commit: str) -> Optional[set]:
+        """Get workflow paths changed by commits between ``since_commit`` and HEAD.
+
+        Catches files a checkout or pull rewrote with unchanged size and
+        mtime. Working-tree edits and untracked files are left to the stat
+        check, so they are not re-read on every run. Returns None when git
+        cannot answer (not a checkout, unknown commit), in which case
+        callers rely on stat data alone.
+        """
+        diff = self._git(
+            "diff", "--name-only", "--relative", since_commit, "HEAD", "--"
+        )
+        if diff is None:
+            return None
+
+        changed = set()
+        for line in diff.splitlines():
+            if line:
+                changed.add(os.path.normpath(os.path.join(self.workflows_dir, line)))
+        return changed
 
     def format_workflow_name(self, filename: str) -> str:
         """Convert filename to readable workflow name."""
@@ -153,36 +907,125 @@ class WorkflowDatabase:
 
         return " ".join(readable_parts)
 
-    def analyze_workflow_file(self, file_path: str) -> Optional[Dict[str, Any]]:
-        """Analyze a single workflow file and extract metadata."""
+    def should_stream(self, file_path: str) -> bool:
+        """Whether a file is over the in-memory parse ceiling and can be streamed."""
+        if os.path.getsize(file_path) <= self.max_parse_bytes:
+            return False
+        if ijson is None:
+            print(
+                f"Warning: {file_path} exceeds {self.max_parse_bytes} bytes; "
+                "install ijson to stream it instead of parsing it in memory"
+            )
+            return False
+        return True
+
+    def analyze_workflow_file(
+        self, file_path: str, content: Optional[bytes] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Analyze a single workflow file and extract metadata.
+
+        The file is read once; pass ``content`` when the caller already has
+        the bytes so hashing, sizing and parsing all share that buffer.
+        Files above ``max_parse_bytes`` are streamed instead. Only node
+        ids/names/types and connection edges are kept, not the raw document.
+
+        Content seen before (same hash, even under another filename) reuses
+        the stored analysis from ``analysis_cache`` without being parsed.
+        """
+        data = None
+        if content is None and self.should_stream(file_path):
+            try:
+                data, file_hash, file_size = stream_workflow_document(file_path)
+            except ValueError as e:
+                print(f"Error reading {file_path}: {str(e)}")
+                return None
+        else:
+            if content is None:
+                with open(file_path, "rb") as f:
+                    content = f.read()
+            file_size = len(content)
+            file_hash = self.get_content_hash(content)
+
+        analysis = self._get_cached_analysis(file_hash)
+        if analysis is None:
+            if data is None:
+                try:
+                    data = parse_workflow_json(content)
+                except ValueError as e:  # JSONDecodeError and UnicodeDecodeError
+                    print(f"Error reading {file_path}: {str(e)}")
+                    return None
+            analysis = self._analyze_document(data)
+            workflow = self._build_workflow(
+                os.path.basename(file_path), analysis, file_hash, file_size
+            )
+            workflow["analysis"] = analysis  # new content: store in the cache
+            return workflow
+
+        return self._build_workflow(
+            os.path.basename(file_path), analysis, file_hash, file_size
+        )
+
+    def _get_cached_analysis(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Look up a stored analysis for content with this hash, if any."""
+        if not self.use_analysis_cache:
+            return None
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except (json.JSONDecodeError, UnicodeDecodeError) as e:
-            print(f"Error reading {file_path}: {str(e)}")
+            with self.connections.reader() as conn:
+                row = conn.execute(
+                    "SELECT analysis FROM analysis_cache "
+                    "WHERE content_hash = ? AND version = ?",
+                    (content_hash, ANALYSIS_VERSION),
+                ).fetchone()
+        except sqlite3.Error:
             return None
+        return parse_workflow_json(row[0]) if row else None
 
-        filename = os.path.basename(file_path)
-        file_size = os.path.getsize(file_path)
-        file_hash = self.get_file_hash(file_path)
+    def _analyze_document(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Derive everything about a workflow that depends only on its content.
 
-        # Extract basic metadata
-        workflow = {
-            "filename": filename,
-            "name": self.format_workflow_name(filename),
+        The result is JSON-serializable and filename-independent, so it can
+        be cached by content hash and reused for copies and renames.
+        """
+        nodes = [
+            {key: node[key] for key in NODE_FIELDS if key in node}
+            for node in data.get("nodes", [])
+        ]
+        trigger_type, integrations = self.analyze_nodes(nodes)
+        return {
             "workflow_id": data.get("id", ""),
             "active": data.get("active", False),
-            "nodes": data.get("nodes", []),
-            "connections": data.get("connections", {}),
+            "json_name": data.get("name", "").strip(),
+            "json_description": data.get("description", "").strip(),
             "tags": data.get("tags", []),
             "created_at": data.get("createdAt", ""),
             "updated_at": data.get("updatedAt", ""),
+            "nodes": nodes,
+            "edges": extract_connection_edges(data.get("connections", {})),
+            "trigger_type": trigger_type,
+            "integrations": list(integrations),
+        }
+
+    def _build_workflow(
+        self, filename: str, analysis: Dict[str, Any], file_hash: str, file_size: int
+    ) -> Dict[str, Any]:
+        """Combine a content analysis with file details into a workflow row."""
+        # Extract basic metadata
+        workflow = {
+            "filename": filename,
+            "name": self.format_workflow_name(filename),
+            "workflow_id": analysis["workflow_id"],
+            "active": analysis["active"],
+            "nodes": analysis["nodes"],
+            "edges": analysis["edges"],
+            "tags": analysis["tags"],
+            "created_at": analysis["created_at"],
+            "updated_at": analysis["updated_at"],
             "file_hash": file_hash,
             "file_size": file_size,
         }
 
         # Use JSON name if available and meaningful, otherwise use formatted filename
-        json_name = data.get("name", "").strip()
+        json_name = analysis["json_name"]
         if (
             json_name
             and json_name != filename.replace(".json", "")
@@ -204,15 +1047,14 @@ class WorkflowDatabase:
             complexity = "high"
         workflow["complexity"] = complexity
 
-        # Find trigger type and integrations
-        trigger_type, integrations = self.analyze_nodes(workflow["nodes"])
+        trigger_type = analysis["trigger_type"]
+        integrations = analysis["integrations"]
         workflow["trigger_type"] = trigger_type
         workflow["integrations"] = list(integrations)
 
         # Use JSON description if available, otherwise generate one
-        json_description = data.get("description", "").strip()
-        if json_description:
-            workflow["description"] = json_description
+        if analysis["json_description"]:
+            workflow["description"] = analysis["json_description"]
         else:
             workflow["description"] = self.generate_description(
                 workflow, trigger_type, integrations
@@ -225,108 +1067,7 @@ class WorkflowDatabase:
         trigger_type = "Manual"
         integrations = set()
 
-        # Enhanced service mapping for better recognition
-        service_mappings = {
-            # Messaging & Communication
-            "telegram": "Telegram",
-            "telegramTrigger": "Telegram",
-            "discord": "Discord",
-            "slack": "Slack",
-            "whatsapp": "WhatsApp",
-            "mattermost": "Mattermost",
-            "teams": "Microsoft Teams",
-            "rocketchat": "Rocket.Chat",
-            # Email
-            "gmail": "Gmail",
-            "mailjet": "Mailjet",
-            "emailreadimap": "Email (IMAP)",
-            "emailsendsmt": "Email (SMTP)",
-            "outlook": "Outlook",
-            # Cloud Storage
-            "googledrive": "Google Drive",
-            "googledocs": "Google Docs",
-            "googlesheets": "Google Sheets",
-            "dropbox": "Dropbox",
-            "onedrive": "OneDrive",
-            "box": "Box",
-            # Databases
-            "postgres": "PostgreSQL",
-            "mysql": "MySQL",
-            "mongodb": "MongoDB",
-            "redis": "Redis",
-            "airtable": "Airtable",
-            "notion": "Notion",
-            # Project Management
-            "jira": "Jira",
-            "github": "GitHub",
-            "gitlab": "GitLab",
-            "trello": "Trello",
-            "asana": "Asana",
-            "mondaycom": "Monday.com",
-            # AI/ML Services
-            "openai": "OpenAI",
-            "anthropic": "Anthropic",
-            "huggingface": "Hugging Face",
-            # Social Media
-            "linkedin": "LinkedIn",
-            "twitter": "Twitter/X",
-            "facebook": "Facebook",
-            "instagram": "Instagram",
-            # E-commerce
-            "shopify": "Shopify",
-            "stripe": "Stripe",
-            "paypal": "PayPal",
-            # Analytics
-            "googleanalytics": "Google Analytics",
-            "mixpanel": "Mixpanel",
-            # Calendar & Tasks
-            "googlecalendar": "Google Calendar",
-            "googletasks": "Google Tasks",
-            "cal": "Cal.com",
-            "calendly": "Calendly",
-            # Forms & Surveys
-            "typeform": "Typeform",
-            "googleforms": "Google Forms",
-            "form": "Form Trigger",
-            # Development Tools
-            "webhook": "Webhook",
-            "httpRequest": "HTTP Request",
-            "graphql": "GraphQL",
-            "sse": "Server-Sent Events",
-            # Utility nodes (exclude from integrations)
-            "set": None,
-            "function": None,
-            "code": None,
-            "if": None,
-            "switch": None,
-            "merge": None,
-            "split": None,
-            "stickynote": None,
-            "stickyNote": None,
-            "wait": None,
-            "schedule": None,
-            "cron": None,
-            "manual": None,
-            "stopanderror": None,
-            "noop": None,
-            "noOp": None,
-            "error": None,
-            "limit": None,
-            "aggregate": None,
-            "summarize": None,
-            "filter": None,
-            "sort": None,
-            "removeDuplicates": None,
-            "dateTime": None,
-            "extractFromFile": None,
-            "convertToFile": None,
-            "readBinaryFile": None,
-            "readBinaryFiles": None,
-            "executionData": None,
-            "executeWorkflow": None,
-            "executeCommand": None,
-            "respondToWebhook": None,
-        }
+        taxonomy = get_taxonomy()
 
         for node in nodes:
             node_type = node.get("type", "")
@@ -341,58 +1082,12 @@ class WorkflowDatabase:
                 if "manual" not in node_type.lower():
                     trigger_type = "Webhook"
 
-            # Extract integrations with enhanced mapping
-            service_name = None
-
-            # Handle n8n-nodes-base nodes
-            if node_type.startswith("n8n-nodes-base."):
-                raw_service = node_type.replace("n8n-nodes-base.", "").lower()
-                raw_service = raw_service.replace("trigger", "")
-                service_name = service_mappings.get(
-                    raw_service, raw_service.title() if raw_service else None
-                )
-
-            # Handle @n8n/ namespaced nodes
-            elif node_type.startswith("@n8n/"):
-                raw_service = (
-                    node_type.split(".")[-1].lower()
-                    if "." in node_type
-                    else node_type.lower()
-                )
-                raw_service = raw_service.replace("trigger", "")
-                service_name = service_mappings.get(
-                    raw_service, raw_service.title() if raw_service else None
-                )
-
-            # Handle custom nodes
-            elif "-" in node_type or "@" in node_type:
-                # Try to extract service name from custom node names like "n8n-nodes-youtube-transcription-kasha.youtubeTranscripter"
-                parts = node_type.lower().split(".")
-                for part in parts:
-                    if "youtube" in part:
-                        service_name = "YouTube"
-                        break
-                    elif "telegram" in part:
-                        service_name = "Telegram"
-                        break
-                    elif "discord" in part:
-                        service_name = "Discord"
-                        break
-                    elif "calcslive" in part:
-                        service_name = "CalcsLive"
-                        break
-
-            # Also check node names for service hints (but avoid false positives)
-            for service_key, service_value in service_mappings.items():
-                if service_key in node_name and service_value:
-                    # Avoid false positive: "cal" in calcslive-related terms should not match "Cal.com"
-                    if service_key == "cal" and any(
-                        term in node_name.lower()
-                        for term in ["calcslive", "calc", "calculation"]
-                    ):
-                        continue
-                    service_name = service_value
-                    break
+            # Extract integrations from the node type, preferring a service
+            # named in the node itself (e.g. an HTTP Request called "Slack API")
+            service_name = taxonomy.service_for_node_type(node_type)
+            name_service = taxonomy.service_for_node_name(node_name)
+            if name_service:
+                service_name = name_service
 
             # Add to integrations if valid service found
             if service_name and service_name not in ["None", None]:
@@ -452,90 +1147,766 @@ class WorkflowDatabase:
 
         return desc + "."
 
-    def index_all_workflows(self, force_reindex: bool = False) -> Dict[str, int]:
-        """Index all workflow files. Only reprocesses changed files unless force_reindex=True."""
+    def _analyze_if_changed(
+        self, file_path: str, known_hash: Optional[str] = None
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Analyze a workflow file unless its hash still matches the indexed one.
+
+        Returns a ``(status, workflow_data)`` pair where status is one of
+        ``processed``, ``skipped`` or ``errors``. Runs in worker processes
+        during parallel indexing, so it must not touch the database.
+        """
+        try:
+            content = None
+            if not self.should_stream(file_path):
+                with open(file_path, "rb") as f:
+                    content = f.read()
+                if (
+                    known_hash is not None
+                    and self.get_content_hash(content) == known_hash
+                ):
+                    return "skipped", None
+
+            workflow_data = self.analyze_workflow_file(file_path, content)
+            if not workflow_data:
+                return "errors", None
+            if workflow_data["file_hash"] == known_hash:  # streamed, unchanged
+                return "skipped", None
+            return "processed", workflow_data
+        except Exception as e:
+            print(f"Error processing {file_path}: {str(e)}")
+            return "errors", None
+
+    def _workflow_row(self, workflow_data: Dict) -> Tuple:
+        """Flatten analyzed workflow data into an UPSERT_SQL parameter tuple."""
+        return (
+            workflow_data["filename"],
+            workflow_data["name"],
+            workflow_data["workflow_id"],
+            workflow_data["active"],
+            workflow_data["description"],
+            workflow_data["trigger_type"],
+            workflow_data["complexity"],
+            workflow_data["node_count"],
+            json.dumps(workflow_data["integrations"]),
+            json.dumps(workflow_data["tags"]),
+            workflow_data["created_at"],
+            workflow_data["updated_at"],
+            workflow_data.get("file_path"),
+            workflow_data["file_hash"],
+            workflow_data["file_size"],
+            workflow_data.get("file_mtime"),
+            workflow_data.get("file_inode"),
+            self.workflow_category(workflow_data["filename"]),
+        )
+
+    def _write_workflows(
+        self, conn: sqlite3.Connection, batch: List[Dict], stats: Dict[str, int]
+    ) -> None:
+        """Write a batch of analyzed workflows with a single executemany.
+
+        If the batch fails it is retried row by row so one bad workflow only
+        counts as an error instead of discarding its neighbours.
+        """
+        if not batch:
+            return
+        try:
+            conn.executemany(UPSERT_SQL, [self._workflow_row(w) for w in batch])
+            self._write_integrations(conn, batch)
+            self._write_graph(conn, batch)
+            self._write_analysis_cache(conn, batch)
+            stats["processed"] += len(batch)
+        except sqlite3.Error:
+            for workflow_data in batch:
+                try:
+                    conn.execute(UPSERT_SQL, self._workflow_row(workflow_data))
+                    self._write_integrations(conn, [workflow_data])
+                    self._write_graph(conn, [workflow_data])
+                    self._write_analysis_cache(conn, [workflow_data])
+                    stats["processed"] += 1
+                except Exception as e:
+                    print(f"Error processing {workflow_data['filename']}: {str(e)}")
+                    stats["errors"] += 1
+
+    def _write_integrations(
+        self, conn: sqlite3.Connection, batch: List[Dict]
+    ) -> None:
+        """Replace the workflow_integrations rows of already-written workflows."""
+        taxonomy = get_taxonomy()
+        conn.executemany(
+            "DELETE FROM workflow_integrations WHERE workflow_id = "
+            "(SELECT id FROM workflows WHERE filename = ?)",
+            [(w["filename"],) for w in batch],
+        )
+        conn.executemany(
+            "INSERT INTO workflow_integrations (workflow_id, integration, category) "
+            "SELECT id, ?, ? FROM workflows WHERE filename = ?",
+            [
+                (integration, taxonomy.category_for(integration), w["filename"])
+                for w in batch
+                for integration in set(w["integrations"])
+            ],
+        )
+
+    def _write_graph(self, conn: sqlite3.Connection, batch: List[Dict]) -> None:
+        """Replace the workflow_nodes and workflow_edges rows of written workflows."""
+        placeholders = ", ".join("?" * len(batch))
+        workflow_ids = dict(
+            conn.execute(
+                f"SELECT filename, id FROM workflows WHERE filename IN ({placeholders})",
+                [w["filename"] for w in batch],
+            )
+        )
+        for table in ("workflow_nodes", "workflow_edges"):
+            conn.executemany(
+                f"DELETE FROM {table} WHERE workflow_id = ?",
+                [(workflow_id,) for workflow_id in workflow_ids.values()],
+            )
+
+        node_rows, edge_rows = [], []
+        for w in batch:
+            workflow_id = workflow_ids[w["filename"]]
+            # Connections reference nodes by name, or by id in some exports
+            types_by_name, types_by_id = {}, {}
+            for position, node in enumerate(w["nodes"]):
+                node_rows.append(
+                    (
+                        workflow_id,
+                        position,
+                        node.get("id"),
+                        node.get("name"),
+                        node.get("type"),
+                    )
+                )
+                types_by_name[node.get("name")] = node.get("type")
+                types_by_id[node.get("id")] = node.get("type")
+            for position, edge in enumerate(w["edges"]):
+                source, target, output_index, connection_type, output_count = edge
+                edge_rows.append(
+                    (
+                        workflow_id,
+                        position,
+                        source,
+                        types_by_name.get(source, types_by_id.get(source)),
+                        target,
+                        types_by_name.get(target, types_by_id.get(target)),
+                        output_index,
+                        output_count,
+                        connection_type,
+                    )
+                )
+
+        conn.executemany(
+            "INSERT INTO workflow_nodes (workflow_id, position, node_id, name, type) "
+            "VALUES (?, ?, ?, ?, ?)",
+            node_rows,
+        )
+        conn.executemany(
+            "INSERT INTO workflow_edges (workflow_id, position, source_node, "
+            "source_type, target_node, target_type, output_index, output_count, "
+            "connection_type) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            edge_rows,
+        )
+
+    def _write_analysis_cache(
+        self, conn: sqlite3.Connection, batch: List[Dict]
+    ) -> None:
+        """Store newly computed analyses under their content hash."""
+        conn.executemany(
+            "INSERT OR REPLACE INTO analysis_cache (content_hash, version, analysis) "
+            "VALUES (?, ?, ?)",
+            [
+                (w["file_hash"], ANALYSIS_VERSION, json.dumps(w["analysis"]))
+                for w in batch
+                if "analysis" in w
+            ],
+        )
+
+    def _prune_caches(self, conn: sqlite3.Connection) -> None:
+        """Drop cached analyses and diagrams no indexed workflow refers to any more."""
+        conn.execute(
+            """
+            DELETE FROM analysis_cache
+            WHERE version != ?
+               OR content_hash NOT IN (
+                   SELECT file_hash FROM workflows WHERE file_hash IS NOT NULL
+               )
+            """,
+            (ANALYSIS_VERSION,),
+        )
+        conn.execute(
+            """
+            DELETE FROM workflow_diagrams
+            WHERE version != ?
+               OR file_hash NOT IN (
+                   SELECT file_hash FROM workflows WHERE file_hash IS NOT NULL
+               )
+            """,
+            (DIAGRAM_VERSION,),
+        )
+
+    def _backfill_integrations(self, conn: sqlite3.Connection) -> None:
+        """Populate workflow_integrations from the JSON column of existing rows."""
+        taxonomy = get_taxonomy()
+        rows = []
+        for workflow_id, integrations in conn.execute(
+            "SELECT id, integrations FROM workflows"
+        ):
+            for integration in set(json.loads(integrations or "[]")):
+                rows.append(
+                    (workflow_id, integration, taxonomy.category_for(integration))
+                )
+        conn.executemany(
+            "INSERT INTO workflow_integrations (workflow_id, integration, category) "
+            "VALUES (?, ?, ?)",
+            rows,
+        )
+
+    def _begin_bulk_load(self, conn: sqlite3.Connection) -> None:
+        """Prepare a connection for a full reload of the workflows table.
+
+        The FTS triggers are dropped inside the load transaction, so readers
+        never observe them missing; _end_bulk_load rebuilds the FTS tables in
+        one pass and recreates them before committing.
+        """
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA cache_size=-65536")  # 64 MB page cache
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("BEGIN")
+        for trigger in FTS_TRIGGERS:
+            conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+
+    def _end_bulk_load(self, conn: sqlite3.Connection) -> None:
+        """Rebuild both FTS tables and restore the triggers after a bulk load."""
+        for table in ("workflows_fts", "workflows_trigram"):
+            conn.execute(f"INSERT INTO {table}({table}) VALUES('rebuild')")
+        self._create_fts_triggers(conn)
+        conn.commit()
+
+    def _restore_synchronous(self, conn: sqlite3.Connection) -> None:
+        """Turn fsync back on after a bulk load, rolling back one that failed.
+
+        Call from a ``finally``: the setting outlives the load on the shared
+        writer connection, and cannot be changed inside a transaction.
+        """
+        if conn.in_transaction:
+            conn.rollback()
+        conn.execute("PRAGMA synchronous=NORMAL")
+
+    def index_all_workflows(
+        self,
+        force_reindex: bool = False,
+        workers: int = 1,
+        shard: Optional[Tuple[int, int]] = None,
+    ) -> Dict[str, int]:
+        """Index all workflow files. Only reprocesses changed files unless force_reindex=True.
+
+        Files whose size, mtime and inode match the stored values are skipped
+        without being read. When the workflows directory is a git checkout,
+        files changed by commits since the last indexed commit are
+        re-checked as well.
+
+        With ``workers`` > 1 file analysis is fanned out over a process pool
+        while this process remains the single writer; ``workers=0`` uses
+        every available core. Forced reindexes use a bulk-load path that
+        writes in batches with the FTS triggers off and rebuilds
+        ``workflows_fts`` once at the end.
+
+        Rows for workflow files that no longer exist (deleted, or renamed to
+        a new filename) are removed and reported as ``removed``.
+
+        ``shard=(i, N)`` indexes only the files where ``shard_of`` is ``i``;
+        use a separate database per shard and combine them with merge_shards.
+        """
+        if self.read_only:
+            print(f"⚠️  {self.db_path} is a read-only snapshot; not reindexing")
+            return {"processed": 0, "skipped": 0, "errors": 0, "removed": 0}
+
         if not os.path.exists(self.workflows_dir):
             print(f"Warning: Workflows directory '{self.workflows_dir}' not found.")
-            return {"processed": 0, "skipped": 0, "errors": 0}
+            return {"processed": 0, "skipped": 0, "errors": 0, "removed": 0}
 
         workflows_path = Path(self.workflows_dir)
         json_files = [str(p) for p in workflows_path.rglob("*.json")]
+        if shard is not None:
+            shard_index, shard_count = shard
+            json_files = [
+                p
+                for p in json_files
+                if shard_of(os.path.basename(p), shard_count) == shard_index
+            ]
 
         if not json_files:
             print(f"Warning: No JSON files found in '{self.workflows_dir}' directory.")
-            return {"processed": 0, "skipped": 0, "errors": 0}
+            return {"processed": 0, "skipped": 0, "errors": 0, "removed": 0}
+
+        print(
+            f"Indexing {len(json_files)} workflow files (JSON parser: {JSON_BACKEND})..."
+        )
 
-        print(f"Indexing {len(json_files)} workflow files...")
+        # Pick up edits to search_categories.json since the last run
+        self._category_assignments = None
 
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        with self.connections.writer() as conn:
+            conn.row_factory = sqlite3.Row
+
+            stats = {"processed": 0, "skipped": 0, "errors": 0, "removed": 0}
 
-        stats = {"processed": 0, "skipped": 0, "errors": 0}
+            # Load stored change-detection state in one query instead of one
+            # lookup per file
+            cursor = conn.execute(
+                "SELECT filename, file_path, file_hash, file_size, file_mtime, "
+                "file_inode FROM workflows"
+            )
+            indexed = {row["filename"]: row for row in cursor}
 
-        for file_path in json_files:
-            filename = os.path.basename(file_path)
+            # Rows whose file was deleted or renamed since the last run
+            seen = {os.path.basename(file_path) for file_path in json_files}
+            removed = [(filename,) for filename in indexed if filename not in seen]
 
+            git_changed = None
+            if force_reindex:
+                indexed = {}
+            else:
+                row = conn.execute(
+                    "SELECT value FROM index_meta WHERE key = 'indexed_commit'"
+                ).fetchone()
+                if row:
+                    git_changed = self.get_git_changed_files(row["value"])
+
+            # Only files whose stat changed (or that git reports as changed) are
+            # handed to the analyzer; the analyzer then compares content hashes.
+            pending, known_hashes, file_stats = [], [], []
+            for file_path in json_files:
+                try:
+                    st = os.stat(file_path)
+                except OSError as e:
+                    print(f"Error processing {file_path}: {str(e)}")
+                    stats["errors"] += 1
+                    continue
+
+                row = indexed.get(os.path.basename(file_path))
+                if (
+                    row is not None
+                    and row["file_path"] == self._relative_path(file_path)
+                    and row["file_size"] == st.st_size
+                    and row["file_mtime"] == st.st_mtime_ns
+                    and row["file_inode"] == st.st_ino
+                    and (
+                        git_changed is None
+                        or os.path.normpath(file_path) not in git_changed
+                    )
+                ):
+                    stats["skipped"] += 1
+                    continue
+
+                pending.append(file_path)
+                known_hashes.append(row["file_hash"] if row is not None else None)
+                file_stats.append(st)
+
+            # Forced reindexes rewrite every row, so load them in bulk and rebuild
+            # the FTS index once at the end instead of row by row through triggers
             try:
-                # Check if file needs to be reprocessed
-                if not force_reindex:
-                    current_hash = self.get_file_hash(file_path)
-                    cursor = conn.execute(
-                        "SELECT file_hash FROM workflows WHERE filename = ?",
-                        (filename,),
+                if force_reindex:
+                    self._begin_bulk_load(conn)
+
+                self._index_pending(
+                    conn, pending, known_hashes, file_stats, stats, workers
+                )
+
+                if removed:
+                    conn.executemany(
+                        "DELETE FROM workflows WHERE filename = ?", removed
+                    )
+                    stats["removed"] = len(removed)
+
+                self._prune_caches(conn)
+                recategorized = self._refresh_categories(conn)
+                if stats["processed"] or stats["removed"] or recategorized:
+                    self._bump_generation(conn)
+
+                git_head = self.get_git_head()
+                if git_head:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO index_meta (key, value) "
+                        "VALUES ('indexed_commit', ?)",
+                        (git_head,),
+                    )
+
+                if force_reindex:
+                    self._end_bulk_load(conn)
+                else:
+                    conn.commit()
+            finally:
+                if force_reindex:
+                    self._restore_synchronous(conn)
+
+        print(
+            f"✅ Indexing complete: {stats['processed']} processed, {stats['skipped']} skipped, {stats['removed']} removed, {stats['errors']} errors"
+        )
+        return stats
+
+    def index_workflow_files(self, file_paths: List[str]) -> Dict[str, int]:
+        """Reindex only the given workflow files, e.g. those reported by watch mode.
+
+        Existing files are analyzed if their content changed; paths that no
+        longer exist have their row removed, unless the row already points at
+        a different location (the file was moved rather than deleted).
+        """
+        stats = {"processed": 0, "skipped": 0, "errors": 0, "removed": 0}
+        file_paths = sorted({p for p in file_paths if p.endswith(".json")})
+        if not file_paths:
+            return stats
+        if self.read_only:
+            print(f"⚠️  {self.db_path} is a read-only snapshot; not reindexing")
+            return stats
+
+        with self.connections.writer() as conn:
+            conn.row_factory = sqlite3.Row
+
+            existing, file_stats, removed = [], [], []
+            for file_path in file_paths:
+                try:
+                    st = os.stat(file_path)
+                except FileNotFoundError:
+                    removed.append(
+                        (os.path.basename(file_path), self._relative_path(file_path))
                     )
-                    row = cursor.fetchone()
-                    if row and row["file_hash"] == current_hash:
-                        stats["skipped"] += 1
-                        continue
-
-                # Analyze workflow
-                workflow_data = self.analyze_workflow_file(file_path)
-                if not workflow_data:
+                    continue
+                except OSError as e:
+                    print(f"Error processing {file_path}: {str(e)}")
                     stats["errors"] += 1
                     continue
-
-                # Insert or update in database
-                conn.execute(
-                    """
-                    INSERT OR REPLACE INTO workflows (
-                        filename, name, workflow_id, active, description, trigger_type,
-                        complexity, node_count, integrations, tags, created_at, updated_at,
-                        file_hash, file_size, analyzed_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                """,
-                    (
-                        workflow_data["filename"],
-                        workflow_data["name"],
-                        workflow_data["workflow_id"],
-                        workflow_data["active"],
-                        workflow_data["description"],
-                        workflow_data["trigger_type"],
-                        workflow_data["complexity"],
-                        workflow_data["node_count"],
-                        json.dumps(workflow_data["integrations"]),
-                        json.dumps(workflow_data["tags"]),
-                        workflow_data["created_at"],
-                        workflow_data["updated_at"],
-                        workflow_data["file_hash"],
-                        workflow_data["file_size"],
-                    ),
+                existing.append(file_path)
+                file_stats.append(st)
+
+            # Deletions first, so a file moved within one batch ends up indexed
+            if removed:
+                cursor = conn.executemany(
+                    "DELETE FROM workflows WHERE filename = ? "
+                    "AND (file_path = ? OR file_path IS NULL)",
+                    removed,
                 )
+                stats["removed"] = cursor.rowcount
 
-                stats["processed"] += 1
+            known_hashes = []
+            for file_path in existing:
+                row = conn.execute(
+                    "SELECT file_hash FROM workflows WHERE filename = ?",
+                    (os.path.basename(file_path),),
+                ).fetchone()
+                known_hashes.append(row["file_hash"] if row else None)
 
-            except Exception as e:
-                print(f"Error processing {file_path}: {str(e)}")
-                stats["errors"] += 1
-                continue
+            self._index_pending(conn, existing, known_hashes, file_stats, stats)
 
-        conn.commit()
-        conn.close()
+            if stats["processed"] or stats["removed"]:
+                self._bump_generation(conn)
+            conn.commit()
 
         print(
-            f"✅ Indexing complete: {stats['processed']} processed, {stats['skipped']} skipped, {stats['errors']} errors"
+            f"✅ Reindexed {len(file_paths)} changed files: {stats['processed']} processed, {stats['skipped']} unchanged, {stats['removed']} removed, {stats['errors']} errors"
         )
         return stats
 
+    def shadow_reindex(
+        self, force_reindex: bool = False, workers: int = 1
+    ) -> Dict[str, int]:
+        """Reindex into a shadow copy of the database, then swap it in atomically.
+
+        The live database is copied to ``<db_path>.shadow-<pid>`` with the
+        SQLite backup API and indexed there, so the long write transaction
+        never touches the file readers use. If anything changed, only the
+        INDEX_TABLES are copied back in one short transaction, so rows other
+        services wrote to the same file meanwhile are kept. Readers keep
+        seeing the previous generation until then and the new one on their
+        next query. Raises RuntimeError if this instance is already
+        reindexing.
+        """
+        if self.read_only:
+            print(f"⚠️  {self.db_path} is a read-only snapshot; not reindexing")
+            return {"processed": 0, "skipped": 0, "errors": 0, "removed": 0}
+        if not self._reindex_lock.acquire(blocking=False):
+            raise RuntimeError(f"A reindex of {self.db_path} is already running")
+
+        # Per-process path, so a concurrent CLI run cannot remove our shadow
+        shadow_path = f"{self.db_path}.shadow-{os.getpid()}"
+        try:
+            _remove_db_files(shadow_path)
+            shadow = sqlite3.connect(shadow_path)
+            with self.connections.reader() as live:
+                live.backup(shadow)
+            shadow.close()
+
+            shadow_db = WorkflowDatabase(shadow_path)
+            shadow_db.workflows_dir = self.workflows_dir
+            try:
+                stats = shadow_db.index_all_workflows(
+                    force_reindex=force_reindex, workers=workers
+                )
+            finally:
+                shadow_db.close()
+
+            if stats["processed"] or stats["removed"]:
+                self._swap_in_index(shadow_path)
+                print(f"🔁 Swapped in index generation {self.get_generation()}")
+        finally:
+            _remove_db_files(shadow_path)
+            self._reindex_lock.release()
+        return stats
+
+    def is_reindexing(self) -> bool:
+        """True while shadow_reindex is running on this instance."""
+        return self._reindex_lock.locked()
+
+    def _swap_in_index(self, shadow_path: str) -> None:
+        """Replace the INDEX_TABLES of the live database with the shadow's."""
+        with self.connections.writer() as live:
+            live.execute("ATTACH DATABASE ? AS shadow", (shadow_path,))
+            try:
+                live.execute("BEGIN")
+                live_generation = _read_generation(live)
+                # Like a bulk load: FTS is rebuilt once instead of per row
+                for trigger in FTS_TRIGGERS:
+                    live.execute(f"DROP TRIGGER IF EXISTS main.{trigger}")
+                for table in reversed(INDEX_TABLES):
+                    live.execute(f"DELETE FROM main.{table}")
+                # By name: columns added by migrations sit at the end of
+                # older tables but in schema order in freshly built ones
+                for table in INDEX_TABLES + INDEX_CACHE_TABLES:
+                    columns = ", ".join(
+                        row[1]
+                        for row in live.execute(f"PRAGMA main.table_info({table})")
+                    )
+                    verb = "INSERT"
+                    if table in INDEX_CACHE_TABLES:
+                        verb = "INSERT OR IGNORE"
+                    live.execute(
+                        f"{verb} INTO main.{table} ({columns}) "
+                        f"SELECT {columns} FROM shadow.{table}"
+                    )
+                # Unqualified names resolve to main before the shadow
+                self._prune_caches(live)
+                for table in ("workflows_fts", "workflows_trigram"):
+                    live.execute(
+                        f"INSERT INTO main.{table}({table}) VALUES('rebuild')"
+                    )
+                self._create_fts_triggers(live)
+                # Move past both counts; watch mode may have bumped the live
+                # one while the shadow was indexed
+                generation = max(live_generation, _read_generation(live)) + 1
+                live.execute(
+                    "INSERT OR REPLACE INTO main.index_meta (key, value) "
+                    "VALUES ('generation', ?)",
+                    (str(generation),),
+                )
+                live.commit()
+            finally:
+                if live.in_transaction:
+                    live.rollback()
+                live.execute("DETACH DATABASE shadow")
+
+    def _bump_generation(self, conn: sqlite3.Connection) -> None:
+        """Advance the index generation to mark that indexed content changed."""
+        conn.execute(
+            "INSERT INTO index_meta (key, value) VALUES ('generation', '1') "
+            "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+        )
+
+    def workflow_category(self, filename: str) -> str:
+        """Browse category of a workflow file, UNCATEGORIZED if unassigned."""
+        if self._category_assignments is None:
+            self._category_assignments = load_category_assignments()
+        return self._category_assignments.get(filename, UNCATEGORIZED)
+
+    def _refresh_categories(self, conn: sqlite3.Connection) -> int:
+        """Store current category assignments on rows where they changed."""
+        updates = []
+        for filename, category in conn.execute(
+            "SELECT filename, category FROM workflows"
+        ):
+            assigned = self.workflow_category(filename)
+            if assigned != category:
+                updates.append((assigned, filename))
+        conn.executemany(
+            "UPDATE workflows SET category = ? WHERE filename = ?", updates
+        )
+        return len(updates)
+
+    def get_generation(self) -> int:
+        """Current index generation; it changes whenever indexed content does."""
+        with self.connections.reader() as conn:
+            return _read_generation(conn)
+
+    def _relative_path(self, file_path: str) -> str:
+        """Path of a workflow file relative to the workflows directory."""
+        return Path(os.path.relpath(file_path, self.workflows_dir)).as_posix()
+
+    def _index_pending(
+        self,
+        conn: sqlite3.Connection,
+        pending: List[str],
+        known_hashes: List[Optional[str]],
+        file_stats: List[os.stat_result],
+        stats: Dict[str, int],
+        workers: int = 1,
+    ) -> None:
+        """Analyze candidate files and write the results through ``conn``.
+
+        With ``workers`` > 1 analysis runs in a process pool while this
+        process stays the single writer; ``workers`` <= 0 uses every core.
+        """
+        if workers is None or workers <= 0:
+            workers = os.cpu_count() or 1
+        workers = min(workers, max(1, len(pending)))
+
+        executor = None
+        if workers > 1:
+            print(f"Analyzing {len(pending)} files with {workers} worker processes...")
+            executor = ProcessPoolExecutor(max_workers=workers)
+            chunksize = max(1, len(pending) // (workers * 8))
+            results = executor.map(
+                self._analyze_if_changed, pending, known_hashes, chunksize=chunksize
+            )
+        else:
+            results = map(self._analyze_if_changed, pending, known_hashes)
+
+        # Content unchanged but stat data stale (touch, fresh checkout, move):
+        # refresh it so the next run can skip the file without hashing it
+        stat_updates = []
+        batch = []
+        try:
+            for file_path, st, (status, workflow_data) in zip(
+                pending, file_stats, results
+            ):
+                if status == "processed":
+                    workflow_data["file_path"] = self._relative_path(file_path)
+                    workflow_data["file_mtime"] = st.st_mtime_ns
+                    workflow_data["file_inode"] = st.st_ino
+                    batch.append(workflow_data)
+                    if len(batch) >= self.write_batch_size:
+                        self._write_workflows(conn, batch, stats)
+                        batch = []
+                    continue
+
+                if status == "skipped":
+                    stat_updates.append(
+                        (
+                            self._relative_path(file_path),
+                            st.st_size,
+                            st.st_mtime_ns,
+                            st.st_ino,
+                            os.path.basename(file_path),
+                        )
+                    )
+                stats[status] += 1
+            self._write_workflows(conn, batch, stats)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        if stat_updates:
+            conn.executemany(
+                "UPDATE workflows SET file_path = ?, file_size = ?, file_mtime = ?, "
+                "file_inode = ? WHERE filename = ?",
+                stat_updates,
+            )
+
+    def _cache_generation_of(self, conn: sqlite3.Connection) -> int:
+        """Current index generation, dropping cached results from older ones."""
+        generation = _read_generation(conn)
+        if generation != self._cache_generation:
+            self.result_cache.clear()
+            self._total_cache.clear()
+            self._cache_generation = generation
+        return generation
+
+    def _match_source(
+        self, conn: sqlite3.Connection, query: str
+    ) -> Tuple[str, str, List[Any]]:
+        """Rank expression, FROM/WHERE clause and params matching ``query``.
+
+        Non-Latin queries and queries the word index has no match for are
+        matched as substrings through workflows_trigram. Latin queries need
+        every term long enough for trigrams; non-Latin terms that are too
+        short (most CJK words have two characters) are LIKE-matched on the
+        same columns instead, unranked if no term is long enough.
+        """
+        word_source = (
+            "rank",
+            "FROM workflows_fts fts JOIN workflows w ON w.id = fts.rowid "
+            "WHERE workflows_fts MATCH ?",
+            [query],
+        )
+        if not is_latin(query):
+            terms = query.replace("*", " ").split()
+            long_terms = [term for term in terms if len(term) >= TRIGRAM_MIN_LENGTH]
+            conditions, params = [], []
+            if long_terms:
+                conditions.append("workflows_trigram MATCH ?")
+                params.append(trigram_match(" ".join(long_terms)))
+            for term in terms:
+                if len(term) < TRIGRAM_MIN_LENGTH:
+                    conditions.append(TRIGRAM_LIKE)
+                    params += [_like_pattern(term)] * len(TRIGRAM_COLUMNS)
+            if not long_terms:
+                return "0", "FROM workflows w WHERE " + " AND ".join(conditions), params
+            return (
+                "rank",
+                "FROM workflows_trigram fts JOIN workflows w ON w.id = fts.rowid "
+                "WHERE " + " AND ".join(conditions),
+                params,
+            )
+
+        substring = trigram_match(query)
+        if substring is None:
+            return word_source
+        word_hit = conn.execute(
+            "SELECT 1 FROM workflows_fts WHERE workflows_fts MATCH ? LIMIT 1", (query,)
+        ).fetchone()
+        if word_hit:
+            return word_source
+        return (
+            "rank",
+            "FROM workflows_trigram fts JOIN workflows w ON w.id = fts.rowid "
+            "WHERE workflows_trigram MATCH ?",
+            [substring],
+        )
+
+    @staticmethod
+    def _copy_page(
+        page: Tuple[List[Dict], Optional[int]],
+    ) -> Tuple[List[Dict], Optional[int]]:
+        """Copy of a cached page that callers may modify."""
+        results, total = page
+        return [dict(workflow) for workflow in results], total
+
+    def _page_total(
+        self,
+        conn: sqlite3.Connection,
+        generation: int,
+        total_mode: str,
+        rows: List[sqlite3.Row],
+        offset: int,
+        base_query: str,
+        params,
+    ) -> Optional[int]:
+        """Total matches for a page fetched by search_workflows/search_by_category."""
+        if total_mode == "none":
+            return None
+        if total_mode == "estimate" and (rows or offset == 0):
+            # Lower bound; counting the peeked row keeps one more page in view
+            return offset + len(rows)
+
+        # Exact totals only change when the index does, so paging through
+        # the same query counts once per generation
+        key = (generation, base_query, tuple(params))
+        total = self._total_cache.get(key)
+        if total is MISSING:
+            cursor = conn.execute(f"SELECT COUNT(*) FROM ({base_query})", params)
+            total = cursor.fetchone()[0]
+            self._total_cache.put(key, total)
+        return total
+
     def search_workflows(
         self,
         query: str = "",
@@ -544,129 +1915,269 @@ class WorkflowDatabase:
         active_only: bool = False,
         limit: int = 50,
         offset: int = 0,
-    ) -> Tuple[List[Dict], int]:
-        """Fast search with filters and pagination."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        total_mode: str = "exact",
+        cursor: Optional[str] = None,
+        category_filter: str = "all",
+    ) -> Tuple[List[Dict], Optional[int]]:
+        """Fast search with filters and pagination.
+
+        ``total_mode`` is one of TOTAL_MODES; with "none" the total is None.
+        With ``cursor`` (see encode_cursor) the page starts right after that
+        row instead of skipping ``offset`` rows, which then only positions
+        estimated totals. Pages are served from ``result_cache`` until the
+        index generation changes. Queries the word index cannot answer are
+        matched as substrings (see _match_source).
+        """
+        if total_mode not in TOTAL_MODES:
+            raise ValueError(f"total_mode must be one of {TOTAL_MODES}")
+        after = decode_cursor(cursor) if cursor else None
+
+        with self.connections.reader() as conn:
+            generation = self._cache_generation_of(conn)
+            cache_key = (
+                generation,
+                "search",
+                " ".join(query.split()),
+                trigger_filter,
+                complexity_filter,
+                category_filter,
+                active_only,
+                limit,
+                offset,
+                total_mode,
+                cursor,
+            )
+            cached = self.result_cache.get(cache_key)
+            if cached is not MISSING:
+                return self._copy_page(cached)
 
-        # Build WHERE clause
-        where_conditions = []
-        params = []
+            conn.row_factory = sqlite3.Row
 
-        if active_only:
-            where_conditions.append("w.active = 1")
+            # Build WHERE clause
+            where_conditions = []
+            params = []
 
-        if trigger_filter != "all":
-            where_conditions.append("w.trigger_type = ?")
-            params.append(trigger_filter)
+            if active_only:
+                where_conditions.append("w.active = 1")
 
-        if complexity_filter != "all":
-            where_conditions.append("w.complexity = ?")
-            params.append(complexity_filter)
+            if trigger_filter != "all":
+                where_conditions.append("w.trigger_type = ?")
+                params.append(trigger_filter)
 
-        # Use FTS search if query provided
-        if query.strip():
-            # FTS search with ranking
-            base_query = """
-                SELECT w.*, rank
-                FROM workflows_fts fts
-                JOIN workflows w ON w.id = fts.rowid
-                WHERE workflows_fts MATCH ?
-            """
-            params.insert(0, query)
-        else:
-            # Regular query without FTS
-            base_query = """
-                SELECT w.*, 0 as rank
-                FROM workflows w
-                WHERE 1=1
-            """
-
-        if where_conditions:
-            base_query += " AND " + " AND ".join(where_conditions)
+            if complexity_filter != "all":
+                where_conditions.append("w.complexity = ?")
+                params.append(complexity_filter)
 
-        # Count total results
-        count_query = f"SELECT COUNT(*) as total FROM ({base_query}) t"
-        cursor = conn.execute(count_query, params)
-        total = cursor.fetchone()["total"]
+            if category_filter != "all":
+                where_conditions.append("w.category = ?")
+                params.append(category_filter)
 
-        # Get paginated results
-        if query.strip():
-            base_query += " ORDER BY rank"
-        else:
-            base_query += " ORDER BY w.analyzed_at DESC"
-
-        base_query += f" LIMIT {limit} OFFSET {offset}"
-
-        cursor = conn.execute(base_query, params)
-        rows = cursor.fetchall()
-
-        # Convert to dictionaries and parse JSON fields
-        results = []
-        for row in rows:
-            workflow = dict(row)
-            workflow["integrations"] = json.loads(workflow["integrations"] or "[]")
-
-            # Parse tags and convert dict tags to strings
-            raw_tags = json.loads(workflow["tags"] or "[]")
-            clean_tags = []
-            for tag in raw_tags:
-                if isinstance(tag, dict):
-                    # Extract name from tag dict if available
-                    clean_tags.append(tag.get("name", str(tag.get("id", "tag"))))
-                else:
-                    clean_tags.append(str(tag))
-            workflow["tags"] = clean_tags
+            # Use FTS search if query provided
+            if query.strip():
+                # FTS search with ranking
+                rank, source, match_params = self._match_source(conn, query)
+                base_query = f"SELECT w.*, {rank} AS rank {source}"
+                params[:0] = match_params
+            else:
+                # Regular query without FTS
+                base_query = """
+                    SELECT w.*, 0 as rank
+                    FROM workflows w
+                    WHERE 1=1
+                """
+
+            if where_conditions:
+                base_query += " AND " + " AND ".join(where_conditions)
+
+            # Ties are broken by a unique column so keyset pages never skip or
+            # repeat rows
+            page_query = base_query
+            page_params = list(params)
+            if query.strip():
+                if after:
+                    page_query += f" AND ({rank}, w.id) > (?, ?)"
+                    page_params += [after[0], after[1]]
+                # The alias, since an ORDER BY integer means a column number
+                page_query += " ORDER BY rank, w.id"
+            else:
+                if after:
+                    page_query += " AND (w.analyzed_at, w.filename) < (?, ?)"
+                    page_params += [after[2], after[3]]
+                page_query += " ORDER BY w.analyzed_at DESC, w.filename DESC"
 
-            results.append(workflow)
+            # Estimates fetch one extra row to learn whether another page exists
+            fetch = limit + 1 if total_mode == "estimate" else limit
+            page_query += f" LIMIT {fetch}"
+            if not after:
+                page_query += f" OFFSET {offset}"
 
-        conn.close()
-        return results, total
+            rows = conn.execute(page_query, page_params).fetchall()
 
-    def get_stats(self) -> Dict[str, Any]:
-        """Get database statistics."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+            total = self._page_total(
+                conn, generation, total_mode, rows, offset, base_query, params
+            )
+            rows = rows[:limit]
+
+            # Convert to dictionaries and parse JSON fields
+            results = []
+            for row in rows:
+                workflow = dict(row)
+                workflow["integrations"] = json.loads(workflow["integrations"] or "[]")
+
+                # Parse tags and convert dict tags to strings
+                raw_tags = json.loads(workflow["tags"] or "[]")
+                clean_tags = []
+                for tag in raw_tags:
+                    if isinstance(tag, dict):
+                        # Extract name from tag dict if available
+                        clean_tags.append(tag.get("name", str(tag.get("id", "tag"))))
+                    else:
+                        clean_tags.append(str(tag))
+                workflow["tags"] = clean_tags
+
+                results.append(workflow)
+
+        self.result_cache.put(cache_key, (results, total))
+        return self._copy_page((results, total))
+
+    def search_facets(
+        self,
+        facets: List[str],
+        query: str = "",
+        trigger_filter: str = "all",
+        complexity_filter: str = "all",
+        active_only: bool = False,
+        category_filter: str = "all",
+    ) -> Dict[str, Dict[str, int]]:
+        """Per-value result counts of a search for each of ``facets``.
 
-        # Basic counts
-        cursor = conn.execute("SELECT COUNT(*) as total FROM workflows")
-        total = cursor.fetchone()["total"]
+        Each facet ignores its own filter, so a count is the number of
+        results choosing that value would give. The query is matched once
+        and every facet is grouped from those rows in the same statement.
+        """
+        unknown = [facet for facet in facets if facet not in FACET_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown facets {unknown}; expected {FACET_FIELDS}")
+        facets = list(dict.fromkeys(facets))
+        if not facets:
+            return {}
+
+        with self.connections.reader() as conn:
+            generation = self._cache_generation_of(conn)
+            cache_key = (
+                generation,
+                "facets",
+                " ".join(query.split()),
+                trigger_filter,
+                complexity_filter,
+                category_filter,
+                active_only,
+                tuple(facets),
+            )
+            cached = self.result_cache.get(cache_key)
+            if cached is not MISSING:
+                return {facet: dict(counts) for facet, counts in cached.items()}
+
+            params: List[Any] = []
+            if query.strip():
+                _, source, match_params = self._match_source(conn, query)
+                matched = (
+                    f"SELECT w.id, w.trigger_type, w.complexity, w.category {source}"
+                )
+                params.extend(match_params)
+            else:
+                matched = """
+                    SELECT w.id, w.trigger_type, w.complexity, w.category
+                    FROM workflows w
+                    WHERE 1=1
+                """
+            if active_only:
+                matched += " AND w.active = 1"
+
+            filters = {
+                "trigger_type": trigger_filter,
+                "complexity": complexity_filter,
+                "category": category_filter,
+            }
+            groups = []
+            for facet in facets:
+                conditions = []
+                for field, value in filters.items():
+                    if field != facet and value != "all":
+                        conditions.append(f"m.{field} = ?")
+                        params.append(value)
+                where = " WHERE " + " AND ".join(conditions) if conditions else ""
+                if facet == "integration":
+                    # workflow_integrations holds each integration once per
+                    # workflow, so rows can be counted without DISTINCT
+                    groups.append(
+                        "SELECT 'integration', wi.integration, COUNT(*) "
+                        "FROM matched m JOIN workflow_integrations wi "
+                        f"ON wi.workflow_id = m.id{where} "
+                        "GROUP BY wi.integration"
+                    )
+                else:
+                    groups.append(
+                        f"SELECT '{facet}', m.{facet}, COUNT(*) "
+                        f"FROM matched m{where} GROUP BY m.{facet}"
+                    )
 
-        cursor = conn.execute(
-            "SELECT COUNT(*) as active FROM workflows WHERE active = 1"
-        )
-        active = cursor.fetchone()["active"]
+            rows = conn.execute(
+                f"WITH matched AS MATERIALIZED ({matched}) "
+                + " UNION ALL ".join(groups)
+                + " ORDER BY 3 DESC, 2",
+                params,
+            ).fetchall()
 
-        # Trigger type breakdown
-        cursor = conn.execute("""
-            SELECT trigger_type, COUNT(*) as count 
-            FROM workflows 
-            GROUP BY trigger_type
-        """)
-        triggers = {row["trigger_type"]: row["count"] for row in cursor.fetchall()}
+        counts: Dict[str, Dict[str, int]] = {facet: {} for facet in facets}
+        for facet, value, count in rows:
+            if value is not None:
+                counts[facet][value] = count
+        self.result_cache.put(cache_key, counts)
+        return {facet: dict(values) for facet, values in counts.items()}
 
-        # Complexity breakdown
-        cursor = conn.execute("""
-            SELECT complexity, COUNT(*) as count 
-            FROM workflows 
-            GROUP BY complexity
-        """)
-        complexity = {row["complexity"]: row["count"] for row in cursor.fetchall()}
+    def get_stats(self) -> Dict[str, Any]:
+        """Get database statistics."""
+        with self.connections.reader() as conn:
+            conn.row_factory = sqlite3.Row
 
-        # Node stats
-        cursor = conn.execute("SELECT SUM(node_count) as total_nodes FROM workflows")
-        total_nodes = cursor.fetchone()["total_nodes"] or 0
+            # Basic counts
+            cursor = conn.execute("SELECT COUNT(*) as total FROM workflows")
+            total = cursor.fetchone()["total"]
 
-        # Unique integrations count
-        cursor = conn.execute(
-            "SELECT integrations FROM workflows WHERE integrations != '[]'"
-        )
-        all_integrations = set()
-        for row in cursor.fetchall():
-            integrations = json.loads(row["integrations"])
-            all_integrations.update(integrations)
+            cursor = conn.execute(
+                "SELECT COUNT(*) as active FROM workflows WHERE active = 1"
+            )
+            active = cursor.fetchone()["active"]
+
+            # Trigger type breakdown
+            cursor = conn.execute("""
+                SELECT trigger_type, COUNT(*) as count 
+                FROM workflows 
+                GROUP BY trigger_type
+            """)
+            triggers = {row["trigger_type"]: row["count"] for row in cursor.fetchall()}
+
+            # Complexity breakdown
+            cursor = conn.execute("""
+                SELECT complexity, COUNT(*) as count 
+                FROM workflows 
+                GROUP BY complexity
+            """)
+            complexity = {row["complexity"]: row["count"] for row in cursor.fetchall()}
+
+            # Node stats
+            cursor = conn.execute(
+                "SELECT SUM(node_count) as total_nodes FROM workflows"
+            )
+            total_nodes = cursor.fetchone()["total_nodes"] or 0
 
-        conn.close()
+            # Unique integrations count
+            cursor = conn.execute(
+                "SELECT COUNT(DISTINCT integration) as unique_integrations "
+                "FROM workflow_integrations"
+            )
+            unique_integrations = cursor.fetchone()["unique_integrations"]
 
         return {
             "total": total,
@@ -675,121 +2186,404 @@ class WorkflowDatabase:
             "triggers": triggers,
             "complexity": complexity,
             "total_nodes": total_nodes,
-            "unique_integrations": len(all_integrations),
+            "unique_integrations": unique_integrations,
             "last_indexed": datetime.datetime.now().isoformat(),
         }
 
     def get_service_categories(self) -> Dict[str, List[str]]:
-        """Get service categories for enhanced filtering."""
-        return {
-            "messaging": [
-                "Telegram",
-                "Discord",
-                "Slack",
-                "WhatsApp",
-                "Mattermost",
-                "Microsoft Teams",
-                "Rocket.Chat",
-            ],
-            "email": ["Gmail", "Mailjet", "Email (IMAP)", "Email (SMTP)", "Outlook"],
-            "cloud_storage": [
-                "Google Drive",
-                "Google Docs",
-                "Google Sheets",
-                "Dropbox",
-                "OneDrive",
-                "Box",
-            ],
-            "database": [
-                "PostgreSQL",
-                "MySQL",
-                "MongoDB",
-                "Redis",
-                "Airtable",
-                "Notion",
-            ],
-            "project_management": [
-                "Jira",
-                "GitHub",
-                "GitLab",
-                "Trello",
-                "Asana",
-                "Monday.com",
-            ],
-            "ai_ml": ["OpenAI", "Anthropic", "Hugging Face", "CalcsLive"],
-            "social_media": ["LinkedIn", "Twitter/X", "Facebook", "Instagram"],
-            "ecommerce": ["Shopify", "Stripe", "PayPal"],
-            "analytics": ["Google Analytics", "Mixpanel"],
-            "calendar_tasks": [
-                "Google Calendar",
-                "Google Tasks",
-                "Cal.com",
-                "Calendly",
-            ],
-            "forms": ["Typeform", "Google Forms", "Form Trigger"],
-            "development": [
-                "Webhook",
-                "HTTP Request",
-                "GraphQL",
-                "Server-Sent Events",
-                "YouTube",
-            ],
-        }
+        """Get service categories for enhanced filtering.
+
+        Returns the shared taxonomy's mapping; treat it as read-only.
+        """
+        return get_taxonomy().service_categories
+
+    def get_integration_counts(self) -> List[Dict[str, Any]]:
+        """Get every integration with its category and number of workflows."""
+        with self.connections.reader() as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute("""
+                SELECT integration, category, COUNT(*) as count
+                FROM workflow_integrations
+                GROUP BY integration
+                ORDER BY count DESC, integration
+            """)
+            integrations = [dict(row) for row in cursor.fetchall()]
+        return integrations
+
+    def get_suggestion_terms(self) -> List[Tuple[str, str, int]]:
+        """Workflow names, integrations and tags as (text, type, workflow count)."""
+        with self.connections.reader() as conn:
+            names = conn.execute("""
+                SELECT name, 'workflow', COUNT(*) FROM workflows
+                WHERE name != '' GROUP BY name
+            """).fetchall()
+            integrations = conn.execute("""
+                SELECT integration, 'integration', COUNT(DISTINCT workflow_id)
+                FROM workflow_integrations GROUP BY integration
+            """).fetchall()
+            # Tags are stored as in the workflow file, either strings or
+            # {"id", "name"} objects
+            tags = conn.execute("""
+                SELECT tag, 'tag', COUNT(DISTINCT workflow_id) FROM (
+                    SELECT w.id AS workflow_id,
+                        CASE WHEN j.type = 'object'
+                            THEN json_extract(j.value, '$.name')
+                            ELSE j.value
+                        END AS tag
+                    FROM workflows w, json_each(w.tags) j
+                )
+                WHERE tag IS NOT NULL AND tag != '' GROUP BY tag
+            """).fetchall()
+        return names + integrations + tags
+
+    def get_workflow_graph(
+        self, filename: str
+    ) -> Optional[Tuple[List[Dict[str, Any]], List[Tuple]]]:
+        """Indexed nodes and connection edges of a workflow, or None if not indexed.
+
+        Nodes are ``{"id", "name", "type"}`` dicts in workflow order (keys
+        absent when the workflow omits them); edges use the
+        extract_connection_edges tuple shape, in connection order.
+        """
+        with self.connections.reader() as conn:
+            row = conn.execute(
+                "SELECT id FROM workflows WHERE filename = ?", (filename,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            node_rows = conn.execute(
+                "SELECT node_id, name, type FROM workflow_nodes "
+                "WHERE workflow_id = ? ORDER BY position",
+                (row[0],),
+            ).fetchall()
+            edges = conn.execute(
+                "SELECT source_node, target_node, output_index, connection_type, "
+                "output_count FROM workflow_edges "
+                "WHERE workflow_id = ? ORDER BY position",
+                (row[0],),
+            ).fetchall()
+
+        nodes = [
+            {key: value for key, value in zip(NODE_FIELDS, values) if value is not None}
+            for values in node_rows
+        ]
+        return nodes, edges
+
+    def get_workflow_diagram(self, filename: str) -> Optional[Tuple[str, str]]:
+        """Mermaid diagram of an indexed workflow as ``(file_hash, mermaid)``.
+
+        Diagrams are rendered from the indexed graph on first request and
+        cached by file hash, so unchanged content is never rendered twice.
+        Returns None if the workflow is not indexed.
+        """
+        with self.connections.reader() as conn:
+            row = conn.execute(
+                """
+                SELECT w.file_hash, d.mermaid FROM workflows w
+                LEFT JOIN workflow_diagrams d
+                    ON d.file_hash = w.file_hash AND d.version = ?
+                WHERE w.filename = ?
+                """,
+                (DIAGRAM_VERSION, filename),
+            ).fetchone()
+        if row is None:
+            return None
+
+        file_hash, mermaid = row
+        if mermaid is None:
+            mermaid = generate_mermaid_diagram(*self.get_workflow_graph(filename))
+            if not self.read_only and file_hash:
+                try:
+                    with self.connections.writer(timeout=0.1) as conn:
+                        # The lock timeout only covers this process; also
+                        # give up quickly on another process's write
+                        conn.execute("PRAGMA busy_timeout=100")
+                        try:
+                            conn.execute(
+                                "INSERT OR REPLACE INTO workflow_diagrams "
+                                "(file_hash, version, mermaid) VALUES (?, ?, ?)",
+                                (file_hash, DIAGRAM_VERSION, mermaid),
+                            )
+                        finally:
+                            conn.execute(
+                                "PRAGMA busy_timeout="
+                                f"{int(self.connections.timeout * 1000)}"
+                            )
+                except sqlite3.OperationalError:
+                    pass  # Busy with a reindex; cache it on a later request
+        return file_hash, mermaid
+
+    def _render_diagrams(self, conn: sqlite3.Connection) -> int:
+        """Render and cache diagrams for every workflow that lacks a current one."""
+        rows = conn.execute(
+            """
+            SELECT DISTINCT w.filename, w.file_hash FROM workflows w
+            WHERE w.file_hash IS NOT NULL AND NOT EXISTS (
+                SELECT 1 FROM workflow_diagrams d
+                WHERE d.file_hash = w.file_hash AND d.version = ?
+            )
+            """,
+            (DIAGRAM_VERSION,),
+        ).fetchall()
+        rendered = {}
+        for filename, file_hash in rows:
+            if file_hash not in rendered:
+                rendered[file_hash] = generate_mermaid_diagram(
+                    *self.get_workflow_graph(filename)
+                )
+        conn.executemany(
+            "INSERT OR REPLACE INTO workflow_diagrams (file_hash, version, mermaid) "
+            "VALUES (?, ?, ?)",
+            [(h, DIAGRAM_VERSION, m) for h, m in rendered.items()],
+        )
+        return len(rendered)
 
     def search_by_category(
-        self, category: str, limit: int = 50, offset: int = 0
-    ) -> Tuple[List[Dict], int]:
-        """Search workflows by service category."""
+        self,
+        category: str,
+        limit: int = 50,
+        offset: int = 0,
+        total_mode: str = "exact",
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict], Optional[int]]:
+        """Search workflows by service category.
+
+        ``total_mode``, ``cursor`` and caching work as in search_workflows.
+        """
+        if total_mode not in TOTAL_MODES:
+            raise ValueError(f"total_mode must be one of {TOTAL_MODES}")
+        after = decode_cursor(cursor) if cursor else None
         categories = self.get_service_categories()
         if category not in categories:
-            return [], 0
+            return [], (None if total_mode == "none" else 0)
+
+        with self.connections.reader() as conn:
+            generation = self._cache_generation_of(conn)
+            cache_key = (
+                generation,
+                "category",
+                category,
+                limit,
+                offset,
+                total_mode,
+                cursor,
+            )
+            cached = self.result_cache.get(cache_key)
+            if cached is not MISSING:
+                return self._copy_page(cached)
 
-        services = categories[category]
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-
-        # Build OR conditions for all services in category
-        service_conditions = []
-        params = []
-        for service in services:
-            service_conditions.append("integrations LIKE ?")
-            params.append(f'%"{service}"%')
-
-        where_clause = " OR ".join(service_conditions)
-
-        # Count total results
-        count_query = f"SELECT COUNT(*) as total FROM workflows WHERE {where_clause}"
-        cursor = conn.execute(count_query, params)
-        total = cursor.fetchone()["total"]
-
-        # Get paginated results
-        query = f"""
-            SELECT * FROM workflows 
-            WHERE {where_clause}
-            ORDER BY analyzed_at DESC
-            LIMIT {limit} OFFSET {offset}
-        """
+            conn.row_factory = sqlite3.Row
 
-        cursor = conn.execute(query, params)
-        rows = cursor.fetchall()
-
-        # Convert to dictionaries and parse JSON fields
-        results = []
-        for row in rows:
-            workflow = dict(row)
-            workflow["integrations"] = json.loads(workflow["integrations"] or "[]")
-            raw_tags = json.loads(workflow["tags"] or "[]")
-            clean_tags = []
-            for tag in raw_tags:
-                if isinstance(tag, dict):
-                    clean_tags.append(tag.get("name", str(tag.get("id", "tag"))))
-                else:
-                    clean_tags.append(str(tag))
-            workflow["tags"] = clean_tags
-            results.append(workflow)
+            base_query = """
+                SELECT *, 0 as rank FROM workflows
+                WHERE id IN (
+                    SELECT workflow_id FROM workflow_integrations WHERE category = ?
+                )
+            """
+            page_query = base_query
+            page_params = [category]
+            if after:
+                page_query += " AND (analyzed_at, filename) < (?, ?)"
+                page_params += [after[2], after[3]]
+            fetch = limit + 1 if total_mode == "estimate" else limit
+            page_query += f" ORDER BY analyzed_at DESC, filename DESC LIMIT {fetch}"
+            if not after:
+                page_query += f" OFFSET {offset}"
+
+            rows = conn.execute(page_query, page_params).fetchall()
+
+            total = self._page_total(
+                conn, generation, total_mode, rows, offset, base_query, (category,)
+            )
+            rows = rows[:limit]
+
+            # Convert to dictionaries and parse JSON fields
+            results = []
+            for row in rows:
+                workflow = dict(row)
+                workflow["integrations"] = json.loads(workflow["integrations"] or "[]")
+                raw_tags = json.loads(workflow["tags"] or "[]")
+                clean_tags = []
+                for tag in raw_tags:
+                    if isinstance(tag, dict):
+                        clean_tags.append(tag.get("name", str(tag.get("id", "tag"))))
+                    else:
+                        clean_tags.append(str(tag))
+                workflow["tags"] = clean_tags
+                results.append(workflow)
+
+        self.result_cache.put(cache_key, (results, total))
+        return self._copy_page((results, total))
+
+
+def build_snapshot(
+    snapshot_path: str, workflows_dir: str = "workflows", workers: int = 1
+) -> Dict[str, int]:
+    """Build a compacted, fully analyzed read-only index at ``snapshot_path``.
+
+    Indexes into a scratch file next to the target, drops build-only state,
+    leaves WAL mode, optimizes FTS, vacuums, and atomically replaces the
+    target. WorkflowDatabase opens the result with ``immutable=1`` and
+    skips indexing.
+    """
+    os.makedirs(os.path.dirname(snapshot_path) or ".", exist_ok=True)
+    build_path = f"{snapshot_path}.building"
+    _remove_db_files(build_path)
+
+    builder = WorkflowDatabase(build_path)
+    builder.workflows_dir = workflows_dir
+    stats = builder.index_all_workflows(force_reindex=True, workers=workers)
+
+    conn = sqlite3.connect(build_path)
+    conn.execute("DELETE FROM analysis_cache")
+    # Snapshots cannot cache lazily, so render every diagram up front
+    builder._render_diagrams(conn)
+    builder.close()
+    conn.execute("INSERT INTO workflows_fts(workflows_fts) VALUES('optimize')")
+    conn.execute("INSERT INTO workflows_trigram(workflows_trigram) VALUES('optimize')")
+    conn.execute(
+        "INSERT OR REPLACE INTO index_meta (key, value) VALUES (?, datetime('now'))",
+        (SNAPSHOT_META_KEY,),
+    )
+    conn.commit()
+    conn.execute("ANALYZE")
+    # Immutable readers cannot see a WAL, so fold everything into one file
+    conn.execute("PRAGMA journal_mode=DELETE")
+    conn.execute("VACUUM")
+    conn.close()
+
+    os.chmod(build_path, 0o444)
+    os.replace(build_path, snapshot_path)
+    for path in (f"{snapshot_path}-wal", f"{snapshot_path}-shm"):
+        if os.path.exists(path):
+            os.remove(path)
+    return stats
+
+
+def merge_shards(output_path: str, shard_paths: List[str]) -> int:
+    """Combine shard databases built with ``--shard`` into ``output_path``.
+
+    Rows are staged from every shard, inserted in filename order so the
+    result does not depend on argument order, and workflows_fts is rebuilt
+    once. The merged database is swapped into ``output_path`` the same way
+    as shadow_reindex. Returns the number of merged workflows.
+    """
+    merge_path = f"{output_path}.merging"
+    _remove_db_files(merge_path)
+    merged = WorkflowDatabase(merge_path)
+
+    conn = sqlite3.connect(merge_path)
+    # Set before staging: changing temp_store later (_begin_bulk_load) drops
+    # temp tables
+    conn.execute("PRAGMA temp_store=MEMORY")
+    columns = ", ".join(
+        row[1] for row in conn.execute("PRAGMA table_info(workflows)") if row[1] != "id"
+    )
+    conn.execute(f"CREATE TEMP TABLE staged AS SELECT {columns} FROM workflows WHERE 0")
+    graph_columns = {
+        table: [
+            row[1]
+            for row in conn.execute(f"PRAGMA table_info({table})")
+            if row[1] != "workflow_id"
+        ]
+        for table in ("workflow_nodes", "workflow_edges")
+    }
+    for table, table_columns in graph_columns.items():
+        # Graph rows are staged by filename since workflow ids are renumbered
+        conn.execute(
+            f"CREATE TEMP TABLE staged_{table} AS "
+            f"SELECT '' AS filename, {', '.join(table_columns)} FROM {table} WHERE 0"
+        )
 
-        conn.close()
-        return results, total
+    commits = set()
+    for shard_path in sorted(shard_paths):
+        if not os.path.isfile(shard_path):
+            raise FileNotFoundError(f"Shard database not found: {shard_path}")
+        conn.execute("ATTACH DATABASE ? AS shard", (shard_path,))
+        conn.execute(f"INSERT INTO temp.staged SELECT {columns} FROM shard.workflows")
+        for table, table_columns in graph_columns.items():
+            conn.execute(
+                f"INSERT INTO temp.staged_{table} "
+                f"SELECT w.filename, {', '.join('g.' + c for c in table_columns)} "
+                f"FROM shard.{table} g JOIN shard.workflows w ON w.id = g.workflow_id"
+            )
+        conn.execute(
+            "INSERT OR IGNORE INTO analysis_cache SELECT * FROM shard.analysis_cache"
+        )
+        row = conn.execute(
+            "SELECT value FROM shard.index_meta WHERE key = 'indexed_commit'"
+        ).fetchone()
+        commits.add(row[0] if row else None)
+        conn.commit()
+        conn.execute("DETACH DATABASE shard")
+
+    # Continue the output's generation count so readers see a new generation
+    generation = 0
+    if os.path.isfile(output_path):
+        output_db = WorkflowDatabase(output_path)
+        generation = output_db.get_generation()
+        output_db.close()
+
+    try:
+        merged._begin_bulk_load(conn)
+        conn.execute(
+            f"INSERT OR REPLACE INTO workflows ({columns}) "
+            f"SELECT {columns} FROM temp.staged ORDER BY filename"
+        )
+        merged._backfill_integrations(conn)
+        for table, table_columns in graph_columns.items():
+            conn.execute(
+                f"INSERT INTO {table} (workflow_id, {', '.join(table_columns)}) "
+                f"SELECT w.id, {', '.join('s.' + c for c in table_columns)} "
+                f"FROM temp.staged_{table} s "
+                "JOIN workflows w ON w.filename = s.filename"
+            )
+        conn.execute(
+            "INSERT OR REPLACE INTO index_meta (key, value) VALUES ('generation', ?)",
+            (str(generation + 1),),
+        )
+        if len(commits) == 1 and None not in commits:
+            conn.execute(
+                "INSERT OR REPLACE INTO index_meta (key, value) "
+                "VALUES ('indexed_commit', ?)",
+                (commits.pop(),),
+            )
+        merged._end_bulk_load(conn)
+    finally:
+        merged._restore_synchronous(conn)
+    total = conn.execute("SELECT COUNT(*) FROM workflows").fetchone()[0]
+
+    conn.close()
+
+    try:
+        if os.path.isfile(output_path):
+            # Keep tables other services store in the output file
+            output_db = WorkflowDatabase(output_path)
+            output_db._swap_in_index(merge_path)
+            output_db.close()
+        else:
+            output = sqlite3.connect(output_path, timeout=30)
+            source = sqlite3.connect(merge_path)
+            source.backup(output)
+            source.close()
+            output.close()
+    finally:
+        _remove_db_files(merge_path)
+    return total
+
+
+def _parse_shard(value: str) -> Tuple[int, int]:
+    """Parse an ``i/N`` shard specification for argparse."""
+    import argparse
+
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/N, got '{value}'")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"shard index must be in 0..N-1, got '{value}'")
+    return index, count
 
 
 def main():
@@ -799,15 +2593,81 @@ def main():
     parser = argparse.ArgumentParser(description="N8N Workflow Database")
     parser.add_argument("--index", action="store_true", help="Index all workflows")
     parser.add_argument("--force", action="store_true", help="Force reindex all files")
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Worker processes for indexing (0 = all cores)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Watch the workflows directory and reindex files as they change",
+    )
+    parser.add_argument(
+        "--build-snapshot",
+        nargs="?",
+        const="",
+        metavar="PATH",
+        help="Build a read-only prebuilt index (default: WORKFLOW_DB_PATH)",
+    )
+    parser.add_argument(
+        "--shard",
+        type=_parse_shard,
+        metavar="i/N",
+        help="With --index, index only shard i of N into <db>.shard-i-of-N.db",
+    )
+    parser.add_argument(
+        "--merge",
+        nargs="+",
+        metavar="SHARD_DB",
+        help="Merge shard databases into WORKFLOW_DB_PATH",
+    )
     parser.add_argument("--search", help="Search workflows")
     parser.add_argument("--stats", action="store_true", help="Show database statistics")
 
     args = parser.parse_args()
 
+    if args.build_snapshot is not None:
+        snapshot_path = args.build_snapshot or os.environ.get(
+            "WORKFLOW_DB_PATH", "workflows.db"
+        )
+        stats = build_snapshot(snapshot_path, workers=args.jobs)
+        size_mb = os.path.getsize(snapshot_path) / (1024 * 1024)
+        print(
+            f"✅ Snapshot written to {snapshot_path}: "
+            f"{stats['processed']} workflows, {size_mb:.1f} MB"
+        )
+        return
+
+    db_path = os.environ.get("WORKFLOW_DB_PATH", "workflows.db")
+
+    if args.merge:
+        total = merge_shards(db_path, args.merge)
+        print(f"✅ Merged {len(args.merge)} shards into {db_path}: {total} workflows")
+        return
+
+    if args.index and args.shard:
+        shard_path = shard_db_path(db_path, *args.shard)
+        print(f"Indexing shard {args.shard[0]}/{args.shard[1]} into {shard_path}")
+        stats = WorkflowDatabase(shard_path).index_all_workflows(
+            force_reindex=args.force, workers=args.jobs, shard=args.shard
+        )
+        print(f"Indexed {stats['processed']} workflows")
+        return
+
     db = WorkflowDatabase()
 
-    if args.index:
-        stats = db.index_all_workflows(force_reindex=args.force)
+    if args.watch:
+        from workflow_watch import watch_workflows
+
+        # Catch up on changes made while nothing was watching
+        db.index_all_workflows(force_reindex=args.force, workers=args.jobs)
+        watch_workflows(db)
+
+    elif args.index:
+        stats = db.shadow_reindex(force_reindex=args.force, workers=args.jobs)
         print(f"Indexed {stats['processed']} workflows")
 
     elif args.search:
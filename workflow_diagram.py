@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Workflow Diagrams
+Mermaid.js flowchart generation from indexed workflow nodes and connection edges.
+"""
+
+from typing import Dict, List
+
+# Bump when generate_mermaid_diagram output changes so cached diagrams
+# from older code are regenerated
+DIAGRAM_VERSION = "1"
+
+
+def generate_mermaid_diagram(nodes: List[Dict], edges: List) -> str:
+    """Generate Mermaid.js flowchart code from workflow nodes and connection edges.
+
+    ``edges`` use the extract_connection_edges shape; only ``main``
+    connections are drawn.
+    """
+    if not nodes:
+        return "graph TD\n  EmptyWorkflow[No nodes found in workflow]"
+
+    # Create mapping for node names to ensure valid mermaid IDs
+    mermaid_ids = {}
+    for i, node in enumerate(nodes):
+        node_id = f"node{i}"
+        node_name = node.get("name", f"Node {i}")
+        mermaid_ids[node_name] = node_id
+
+    # Start building the mermaid diagram
+    mermaid_code = ["graph TD"]
+
+    # Add nodes with styling
+    for node in nodes:
+        node_name = node.get("name", "Unnamed")
+        node_id = mermaid_ids[node_name]
+        node_type = node.get("type", "").replace("n8n-nodes-base.", "")
+
+        # Determine node style based on type
+        style = ""
+        if any(x in node_type.lower() for x in ["trigger", "webhook", "cron"]):
+            style = "fill:#b3e0ff,stroke:#0066cc"  # Blue for triggers
+        elif any(x in node_type.lower() for x in ["if", "switch"]):
+            style = "fill:#ffffb3,stroke:#e6e600"  # Yellow for conditional nodes
+        elif any(x in node_type.lower() for x in ["function", "code"]):
+            style = "fill:#d9b3ff,stroke:#6600cc"  # Purple for code nodes
+        elif "error" in node_type.lower():
+            style = "fill:#ffb3b3,stroke:#cc0000"  # Red for error handlers
+        else:
+            style = "fill:#d9d9d9,stroke:#666666"  # Gray for other nodes
+
+        # Add node with label (escaping special characters)
+        clean_name = node_name.replace('"', "'")
+        clean_type = node_type.replace('"', "'")
+        label = f"{clean_name}<br>({clean_type})"
+        mermaid_code.append(f'  {node_id}["{label}"]')
+        mermaid_code.append(f"  style {node_id} {style}")
+
+    # Add connections between nodes
+    for source_name, target_name, i, connection_type, output_count in edges:
+        if connection_type != "main":
+            continue
+        if source_name not in mermaid_ids or target_name not in mermaid_ids:
+            continue
+
+        # Add arrow with output index if multiple outputs
+        label = f" -->|{i}| " if output_count > 1 else " --> "
+        mermaid_code.append(
+            f"  {mermaid_ids[source_name]}{label}{mermaid_ids[target_name]}"
+        )
+
+    # Format the final mermaid diagram code
+    return "\n".join(mermaid_code)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Workflow Suggestions
+In-memory prefix index over workflow names, integrations and tags for typeahead.
+"""
+
+import bisect
+import heapq
+import re
+from typing import Dict, Iterable, List, Tuple
+
+# Most results a single suggest call returns
+MAX_SUGGESTIONS = 20
+
+# Prefixes up to this length match a large share of the index, so their
+# completions are ranked once when the index is built
+PRECOMPUTED_PREFIX_LENGTH = 2
+
+WORD_START = re.compile(r"\w+")
+
+
+class SuggestionIndex:
+    """Sorted-array prefix index answering typeahead queries from memory.
+
+    Every term is keyed by its lowercased text from each word start, so
+    "sla" completes both "Slack" and "Weather via Slack". Completions are
+    ranked by how many workflows use the term, then by length.
+    """
+
+    def __init__(self, terms: Iterable[Tuple[str, str, int]], generation: int = 0):
+        # Index generation the terms were read at (WorkflowDatabase.get_generation)
+        self.generation = generation
+        self._terms: List[Dict[str, object]] = []
+        self._order: List[Tuple[int, int, str]] = []
+        pairs = []
+        for text, kind, count in terms:
+            text = str(text).strip()
+            if not text:
+                continue
+            term_id = len(self._terms)
+            self._terms.append({"text": text, "type": kind, "count": count})
+            self._order.append((-count, len(text), text.lower()))
+            lowered = text.lower()
+            for match in WORD_START.finditer(lowered):
+                pairs.append((lowered[match.start() :], term_id))
+        pairs.sort()
+        self._keys = [key for key, _ in pairs]
+        self._ids = [term_id for _, term_id in pairs]
+
+        self._precomputed: Dict[str, List[int]] = {}
+        for key in self._keys:
+            for length in range(1, min(len(key), PRECOMPUTED_PREFIX_LENGTH) + 1):
+                prefix = key[:length]
+                if prefix not in self._precomputed:
+                    self._precomputed[prefix] = self._rank(prefix, MAX_SUGGESTIONS)
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def _rank(self, prefix: str, limit: int) -> List[int]:
+        """Ids of the best ``limit`` terms with a word starting with ``prefix``."""
+        lo = bisect.bisect_left(self._keys, prefix)
+        hi = bisect.bisect_left(self._keys, prefix[:-1] + chr(ord(prefix[-1]) + 1))
+        matches = set(self._ids[lo:hi])
+        return heapq.nsmallest(limit, matches, key=self._order.__getitem__)
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict[str, object]]:
+        """Top ``limit`` completions of ``prefix`` as {"text", "type", "count"}."""
+        prefix = prefix.strip().lower()
+        limit = min(limit, MAX_SUGGESTIONS)
+        if not prefix or limit <= 0:
+            return []
+        ranked = self._precomputed.get(prefix)
+        if ranked is None:
+            if len(prefix) <= PRECOMPUTED_PREFIX_LENGTH:
+                return []
+            ranked = self._rank(prefix, limit)
+        return [self._terms[term_id] for term_id in ranked[:limit]]
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Workflow Integration Taxonomy
+Compiled registry that maps n8n node types and names to services and categories.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+# Upper bound on memoized node types/names before the caches are reset
+CACHE_LIMIT = 50000
+
+# Node key (lowercased type suffix or name fragment) -> service name.
+# Order matters: when several keys appear in a node name, the first wins.
+SERVICE_MAPPINGS = {
+    # Messaging & Communication
+    "telegram": "Telegram",
+    "telegramTrigger": "Telegram",
+    "discord": "Discord",
+    "slack": "Slack",
+    "whatsapp": "WhatsApp",
+    "mattermost": "Mattermost",
+    "teams": "Microsoft Teams",
+    "rocketchat": "Rocket.Chat",
+    # Email
+    "gmail": "Gmail",
+    "mailjet": "Mailjet",
+    "emailreadimap": "Email (IMAP)",
+    "emailsendsmt": "Email (SMTP)",
+    "outlook": "Outlook",
+    # Cloud Storage
+    "googledrive": "Google Drive",
+    "googledocs": "Google Docs",
+    "googlesheets": "Google Sheets",
+    "dropbox": "Dropbox",
+    "onedrive": "OneDrive",
+    "box": "Box",
+    # Databases
+    "postgres": "PostgreSQL",
+    "mysql": "MySQL",
+    "mongodb": "MongoDB",
+    "redis": "Redis",
+    "airtable": "Airtable",
+    "notion": "Notion",
+    # Project Management
+    "jira": "Jira",
+    "github": "GitHub",
+    "gitlab": "GitLab",
+    "trello": "Trello",
+    "asana": "Asana",
+    "mondaycom": "Monday.com",
+    # AI/ML Services
+    "openai": "OpenAI",
+    "anthropic": "Anthropic",
+    "huggingface": "Hugging Face",
+    # Social Media
+    "linkedin": "LinkedIn",
+    "twitter": "Twitter/X",
+    "facebook": "Facebook",
+    "instagram": "Instagram",
+    # E-commerce
+    "shopify": "Shopify",
+    "stripe": "Stripe",
+    "paypal": "PayPal",
+    # Analytics
+    "googleanalytics": "Google Analytics",
+    "mixpanel": "Mixpanel",
+    # Calendar & Tasks
+    "googlecalendar": "Google Calendar",
+    "googletasks": "Google Tasks",
+    "cal": "Cal.com",
+    "calendly": "Calendly",
+    # Forms & Surveys
+    "typeform": "Typeform",
+    "googleforms": "Google Forms",
+    "form": "Form Trigger",
+    # Development Tools
+    "webhook": "Webhook",
+    "httpRequest": "HTTP Request",
+    "graphql": "GraphQL",
+    "sse": "Server-Sent Events",
+    # Utility nodes (exclude from integrations)
+    "set": None,
+    "function": None,
+    "code": None,
+    "if": None,
+    "switch": None,
+    "merge": None,
+    "split": None,
+    "stickynote": None,
+    "stickyNote": None,
+    "wait": None,
+    "schedule": None,
+    "cron": None,
+    "manual": None,
+    "stopanderror": None,
+    "noop": None,
+    "noOp": None,
+    "error": None,
+    "limit": None,
+    "aggregate": None,
+    "summarize": None,
+    "filter": None,
+    "sort": None,
+    "removeDuplicates": None,
+    "dateTime": None,
+    "extractFromFile": None,
+    "convertToFile": None,
+    "readBinaryFile": None,
+    "readBinaryFiles": None,
+    "executionData": None,
+    "executeWorkflow": None,
+    "executeCommand": None,
+    "respondToWebhook": None,
+}
+
+SERVICE_CATEGORIES = {
+    "messaging": [
+        "Telegram",
+        "Discord",
+        "Slack",
+        "WhatsApp",
+        "Mattermost",
+        "Microsoft Teams",
+        "Rocket.Chat",
+    ],
+    "email": ["Gmail", "Mailjet", "Email (IMAP)", "Email (SMTP)", "Outlook"],
+    "cloud_storage": [
+        "Google Drive",
+        "Google Docs",
+        "Google Sheets",
+        "Dropbox",
+        "OneDrive",
+        "Box",
+    ],
+    "database": [
+        "PostgreSQL",
+        "MySQL",
+        "MongoDB",
+        "Redis",
+        "Airtable",
+        "Notion",
+    ],
+    "project_management": [
+        "Jira",
+        "GitHub",
+        "GitLab",
+        "Trello",
+        "Asana",
+        "Monday.com",
+    ],
+    "ai_ml": ["OpenAI", "Anthropic", "Hugging Face", "CalcsLive"],
+    "social_media": ["LinkedIn", "Twitter/X", "Facebook", "Instagram"],
+    "ecommerce": ["Shopify", "Stripe", "PayPal"],
+    "analytics": ["Google Analytics", "Mixpanel"],
+    "calendar_tasks": [
+        "Google Calendar",
+        "Google Tasks",
+        "Cal.com",
+        "Calendly",
+    ],
+    "forms": ["Typeform", "Google Forms", "Form Trigger"],
+    "development": [
+        "Webhook",
+        "HTTP Request",
+        "GraphQL",
+        "Server-Sent Events",
+        "YouTube",
+    ],
+}
+
+
+# Services recognised inside custom community node types, e.g.
+# "n8n-nodes-youtube-transcription-kasha.youtubeTranscripter"
+CUSTOM_NODE_SERVICES = [
+    ("youtube", "YouTube"),
+    ("telegram", "Telegram"),
+    ("discord", "Discord"),
+    ("calcslive", "CalcsLive"),
+]
+
+# Node names containing these must not match the short "cal" (Cal.com) key
+CAL_FALSE_POSITIVES = ("calcslive", "calc", "calculation")
+
+
+class IntegrationTaxonomy:
+    """Precompiled lookups for node-to-service matching and service categories.
+
+    Build once and reuse: node-type lookups are memoized and node-name
+    matching runs a single regex over the name instead of testing every
+    mapping key as a substring.
+    """
+
+    def __init__(
+        self,
+        service_mappings: Dict[str, Optional[str]],
+        service_categories: Dict[str, List[str]],
+    ):
+        self.service_mappings = service_mappings
+        self.service_categories = service_categories
+
+        # lowercased service -> first category listing it; case-insensitive so
+        # titled fallbacks like "Youtube" still land in the YouTube category
+        self.service_to_category: Dict[str, str] = {}
+        for category, services in service_categories.items():
+            for service in services:
+                self.service_to_category.setdefault(service.lower(), category)
+
+        # Node names are lowercased before matching, so only lowercase keys
+        # with a service can ever match; keep them in priority order.
+        name_keys = [
+            key
+            for key, service in service_mappings.items()
+            if service and key == key.lower()
+        ]
+        self._name_keys = name_keys
+        self._name_priority = {key: i for i, key in enumerate(name_keys)}
+        self._name_pattern = self._compile(name_keys)
+        self._name_pattern_without_cal = self._compile(
+            [key for key in name_keys if key != "cal"]
+        )
+        # Node types and names repeat heavily across workflows
+        self._type_cache: Dict[str, Optional[str]] = {}
+        self._name_cache: Dict[str, Optional[str]] = {}
+
+    @staticmethod
+    def _compile(keys: List[str]) -> "re.Pattern":
+        # A lookahead reports the highest-priority key starting at every
+        # position, overlapping matches included, in one pass over the name.
+        alternation = "|".join(re.escape(key) for key in keys) or "(?!)"
+        return re.compile(f"(?=({alternation}))")
+
+    def service_for_node_type(self, node_type: str) -> Optional[str]:
+        """Map an n8n node type such as ``n8n-nodes-base.slack`` to a service."""
+        if node_type in self._type_cache:
+            return self._type_cache[node_type]
+        if len(self._type_cache) >= CACHE_LIMIT:
+            self._type_cache.clear()
+
+        service_name = None
+
+        # Handle n8n-nodes-base nodes
+        if node_type.startswith("n8n-nodes-base."):
+            raw_service = node_type.replace("n8n-nodes-base.", "").lower()
+            raw_service = raw_service.replace("trigger", "")
+            service_name = self.service_mappings.get(
+                raw_service, raw_service.title() if raw_service else None
+            )
+
+        # Handle @n8n/ namespaced nodes
+        elif node_type.startswith("@n8n/"):
+            raw_service = (
+                node_type.split(".")[-1].lower()
+                if "." in node_type
+                else node_type.lower()
+            )
+            raw_service = raw_service.replace("trigger", "")
+            service_name = self.service_mappings.get(
+                raw_service, raw_service.title() if raw_service else None
+            )
+
+        # Handle custom nodes
+        elif "-" in node_type or "@" in node_type:
+            for part in node_type.lower().split("."):
+                service_name = next(
+                    (s for needle, s in CUSTOM_NODE_SERVICES if needle in part), None
+                )
+                if service_name:
+                    break
+
+        self._type_cache[node_type] = service_name
+        return service_name
+
+    def service_for_node_name(self, node_name: str) -> Optional[str]:
+        """Find the highest-priority service key inside a lowercased node name."""
+        if not node_name:
+            return None
+        if node_name in self._name_cache:
+            return self._name_cache[node_name]
+        if len(self._name_cache) >= CACHE_LIMIT:
+            self._name_cache.clear()
+
+        pattern = self._name_pattern
+        if any(term in node_name for term in CAL_FALSE_POSITIVES):
+            pattern = self._name_pattern_without_cal
+
+        best = None
+        for match in pattern.finditer(node_name):
+            priority = self._name_priority[match.group(1)]
+            if best is None or priority < best:
+                best = priority
+        service_name = None
+        if best is not None:
+            service_name = self.service_mappings[self._name_keys[best]]
+        self._name_cache[node_name] = service_name
+        return service_name
+
+    def category_for(self, service: str) -> Optional[str]:
+        """Get the service category (``messaging``, ``database``...) of a service."""
+        return self.service_to_category.get(service.lower())
+
+
+_taxonomy: Optional[IntegrationTaxonomy] = None
+
+
+def get_taxonomy() -> IntegrationTaxonomy:
+    """Get the shared taxonomy, building it on first use."""
+    global _taxonomy
+    if _taxonomy is None:
+        _taxonomy = IntegrationTaxonomy(SERVICE_MAPPINGS, SERVICE_CATEGORIES)
+    return _taxonomy
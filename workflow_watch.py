@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Workflow Watch Mode
+Incrementally reindexes workflow files as they are added, changed or removed.
+"""
+
+import os
+import queue
+import threading
+import time
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+from workflow_db import WorkflowDatabase
+
+# watchdog event types that mean a file's content or location changed;
+# "opened" (raised by indexing's own reads) and "closed_no_write" are not
+# changes, and queuing them would reindex the same file forever.
+# "closed" is close-after-write.
+CHANGE_EVENTS = ("created", "modified", "moved", "deleted", "closed")
+
+
+def iter_workflow_files(directory: str) -> Iterator[str]:
+    """Normalized paths of every .json file below ``directory``."""
+    for root, _dirs, files in os.walk(directory):
+        for name in files:
+            if name.endswith(".json"):
+                yield os.path.normpath(os.path.join(root, name))
+
+
+class WorkflowWatcher:
+    """Watch the workflows directory and reindex only the files that change.
+
+    Uses watchdog (inotify/FSEvents/kqueue) when it is installed and falls
+    back to polling file stats otherwise. Bursts of events are debounced so
+    a bulk copy into ``workflows/<Service>/`` results in a single reindex.
+    """
+
+    def __init__(
+        self,
+        db: WorkflowDatabase,
+        debounce: float = 0.25,
+        poll_interval: float = 0.25,
+    ):
+        self.db = db
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._events: "queue.Queue[str]" = queue.Queue()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> threading.Thread:
+        """Run the watcher in a background daemon thread."""
+        self._thread = threading.Thread(
+            target=self.run, name="workflow-watcher", daemon=True
+        )
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        """Ask the watch loop to exit and wait for the background thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def run(self):
+        """Watch until stop() is called, reindexing debounced batches of files."""
+        self._stop.clear()
+        observer = self._start_observer()
+        snapshot = None if observer else self._snapshot()
+        backend = "watchdog" if observer else f"polling every {self.poll_interval}s"
+        print(f"👀 Watching '{self.db.workflows_dir}' for changes ({backend})")
+
+        pending: Set[str] = set()
+        last_event = 0.0
+        try:
+            while not self._stop.is_set():
+                if observer is None:
+                    snapshot, changed = self._poll(snapshot)
+                else:
+                    changed = self._drain_events()
+
+                if changed:
+                    pending |= changed
+                    last_event = time.monotonic()
+                elif pending and time.monotonic() - last_event >= self.debounce:
+                    self._reindex(pending)
+                    pending = set()
+
+                if observer is None:
+                    self._stop.wait(self.poll_interval)
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join()
+            if pending:
+                self._reindex(pending)
+
+    def _reindex(self, paths: Set[str]):
+        try:
+            self.db.index_workflow_files(sorted(paths))
+        except Exception as e:
+            print(f"Error reindexing changed workflows: {e}")
+
+    def _drain_events(self) -> Set[str]:
+        """Collect paths queued by the watchdog handler, waiting up to debounce."""
+        changed = set()
+        try:
+            changed.add(self._events.get(timeout=self.debounce))
+            while True:
+                changed.add(self._events.get_nowait())
+        except queue.Empty:
+            pass
+        return changed
+
+    def _start_observer(self):
+        """Start a watchdog observer feeding the event queue, or None if missing."""
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return None
+
+        events = self._events
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.event_type not in CHANGE_EVENTS:
+                    return
+                if event.is_directory:
+                    # A folder moved or copied in brings files that never
+                    # get events of their own
+                    if event.event_type in ("created", "moved"):
+                        target = event.dest_path or event.src_path
+                        for path in iter_workflow_files(str(target)):
+                            events.put(path)
+                    return
+                for path in (event.src_path, getattr(event, "dest_path", None)):
+                    if path and str(path).endswith(".json"):
+                        events.put(os.path.normpath(str(path)))
+
+        observer = Observer()
+        observer.schedule(_Handler(), self.db.workflows_dir, recursive=True)
+        observer.start()
+        return observer
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int, int]]:
+        """Stat every workflow file without reading its content."""
+        snapshot = {}
+        for path in iter_workflow_files(self.db.workflows_dir):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (st.st_mtime_ns, st.st_size, st.st_ino)
+        return snapshot
+
+    def _poll(self, previous: Dict[str, Tuple[int, int, int]]):
+        """Diff a fresh stat snapshot against the previous one."""
+        current = self._snapshot()
+        changed = {
+            path for path, sig in current.items() if previous.get(path) != sig
+        }
+        changed |= previous.keys() - current.keys()
+        return current, changed
+
+
+def watch_workflows(db: WorkflowDatabase, debounce: float = 0.25):
+    """Block and reindex changed workflow files until interrupted."""
+    watcher = WorkflowWatcher(db, debounce=debounce)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching workflows")